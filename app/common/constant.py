@@ -1,2 +1,59 @@
 MAX_REQUESTS = 5
-WINDOW_SECONDS = 60
\ No newline at end of file
+WINDOW_SECONDS = 60
+
+INDEXED_FIELDS = ("status", "department", "position", "location")
+CATEGORICAL_FIELDS = ("department", "position", "location", "status", "organization_id")
+NGRAM_SIZE = 3
+# Filter keys starting with this prefix exclude the listed values
+NEGATED_FILTER_PREFIX = "not_"
+
+EMPLOYEES_DATA_PATH_ENV = "EMPLOYEES_DATA_PATH"
+ORGANIZATIONS_DATA_PATH_ENV = "ORGANIZATIONS_DATA_PATH"
+EMPLOYEE_SNAPSHOT_PATH_ENV = "EMPLOYEE_SNAPSHOT_PATH"
+# Worker count read by uvicorn/gunicorn as the default for --workers
+WEB_CONCURRENCY_ENV = "WEB_CONCURRENCY"
+SNAPSHOT_VERSION = 1
+
+QUERY_CACHE_MAX_ENTRIES = 10000
+QUERY_CACHE_TTL_SECONDS = 30
+
+RATE_LIMIT_BACKEND_ENV = "RATE_LIMIT_BACKEND"
+RATE_LIMIT_DB_PATH_ENV = "RATE_LIMIT_DB_PATH"
+RATE_LIMIT_EVICTION_INTERVAL = 1000
+# How long a check waits for another worker's lock on the SQLite counters
+# before the request is let through
+RATE_LIMIT_BUSY_TIMEOUT_SECONDS = 0.005
+
+SERIALIZER_FRAGMENT_CACHE_SIZE = 100000
+
+LOG_QUEUE_SIZE = 10000
+# Fraction of records kept per level, and the most records per second per level
+LOG_SAMPLE_RATES = {"DEBUG": 1.0, "INFO": 1.0, "WARNING": 1.0, "ERROR": 1.0, "CRITICAL": 1.0}
+LOG_RATE_LIMITS = {"DEBUG": 100, "INFO": 1000, "WARNING": 1000, "ERROR": 1000, "CRITICAL": 1000}
+
+SEARCH_EXECUTION_MODE_ENV = "SEARCH_EXECUTION_MODE"
+SEARCH_EXECUTION_MODE = "thread"
+SEARCH_MAX_WORKERS = 4
+SEARCH_MAX_QUEUE = 32
+SEARCH_TIMEOUT_SECONDS = 5.0
+
+BATCH_MAX_QUERIES = 50
+
+EXPORT_CHUNK_ROWS = 500
+
+METRICS_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+METRICS_MAX_SERIES = 5000
+SERVER_TIMING_ENV = "SERVER_TIMING"
+
+PROFILING_ENABLED_ENV = "PROFILING_ENABLED"
+PROFILING_SAMPLE_RATE_ENV = "PROFILING_SAMPLE_RATE"
+PROFILING_OUTPUT_DIR_ENV = "PROFILING_OUTPUT_DIR"
+PROFILING_OUTPUT_DIR = "profiles"
+PROFILING_HEADER = "X-Profile"
+PROFILING_WINDOW_SECONDS = 60
+
+SEARCH_COST_BASE = 1.0
+SEARCH_COST_ROWS_PER_UNIT = 1000
+TENANT_COST_PER_SECOND = 1000.0
+TENANT_COST_BURST = 5000.0
+TENANT_WEIGHT = 1.0
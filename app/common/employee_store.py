@@ -0,0 +1,719 @@
+import hashlib
+import heapq
+import itertools
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict
+from functools import partial
+from app.common.constant import (
+    EMPLOYEE_SNAPSHOT_PATH_ENV, EMPLOYEES_DATA_PATH_ENV, INDEXED_FIELDS, NGRAM_SIZE,
+    ORGANIZATIONS_DATA_PATH_ENV, WEB_CONCURRENCY_ENV,
+)
+from app.common.employee_table import EmployeeTable
+from app.common.logging_config import get_json_logger
+from app.common.snapshot import read_snapshot
+from app.employee_data.employee_data import employees, organizations
+from app.employee_data.loader import file_digest, iter_employees, iter_organizations
+
+logger = get_json_logger()
+
+# View and partition versions are unique across every store in the process,
+# so a partition version alone identifies the rows a cached result was
+# computed from.
+_versions = itertools.count(1)
+# Written data is only known to the process that applied the writes, so the
+# revision of a written partition includes this process's random id
+_PROCESS_ID = os.urandom(8).hex()
+
+
+def _ngrams(text: str) -> set:
+    return {text[i:i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+# Posting lists are sorted arrays of 32-bit row ids: 4 bytes per entry
+# instead of a set slot plus hash, and the same layout as in snapshots
+_new_posting = partial(array, "I")
+
+
+def _add(index, key, row_id: int):
+    posting = index[key]
+    if not posting or posting[-1] < row_id:
+        # Rows are appended in row id order, so loading never shifts entries
+        posting.append(row_id)
+        return
+    position = bisect_left(posting, row_id)
+    if position == len(posting) or posting[position] != row_id:
+        posting.insert(position, row_id)
+
+
+def _discard(index, key, row_id: int):
+    posting = index.get(key)
+    if posting is not None:
+        position = bisect_left(posting, row_id)
+        if position < len(posting) and posting[position] == row_id:
+            del posting[position]
+        if not posting:
+            del index[key]
+
+
+def _contains(posting, row_id: int) -> bool:
+    position = bisect_left(posting, row_id)
+    return position < len(posting) and posting[position] == row_id
+
+
+def _intersect(postings) -> set:
+    postings = sorted(postings, key=len)
+    row_ids = set(postings[0])
+    for posting in postings[1:]:
+        if not row_ids:
+            break
+        if len(row_ids) * 16 < len(posting):
+            # Few candidates left: probe the sorted posting instead of
+            # hashing all of it
+            row_ids = {row_id for row_id in row_ids if _contains(posting, row_id)}
+        else:
+            row_ids.intersection_update(posting)
+    return row_ids
+
+
+class OrgPartition:
+    """
+    Employees of a single organization plus their inverted indexes.
+
+    Rows are held in a columnar EmployeeTable and addressed by row id. For
+    every field in INDEXED_FIELDS the partition keeps a mapping from the
+    lowercased value to the sorted array of row ids holding it, so equality
+    filters are answered by intersecting/merging postings instead of
+    scanning every row. Lowercased first and last names are additionally
+    indexed by their n-grams for substring search and kept in one sorted
+    array for prefix lookups.
+
+    A partition is never modified once it has been published through a
+    StoreView; writers mutate a `copy` and publish that instead. Deleted rows
+    are tombstoned and dropped by `compacted`.
+
+    `version` is unique within the process and changes whenever the
+    partition is rewritten. `revision` is None for data as loaded and
+    identifies the write across processes once the partition was written.
+
+    Args:
+        employees (iterable): Employee records belonging to the organization.
+    """
+
+    def __init__(self, employees=()):
+        self.table = EmployeeTable()
+        self.indexes = {field: defaultdict(_new_posting) for field in INDEXED_FIELDS}
+        self.name_grams = defaultdict(_new_posting)
+        self.sorted_names = []
+        self.sorted_name_rows = array("I")
+        self.deleted = set()
+        self.version = next(_versions)
+        self.revision = None
+        self._id_rows = None
+        self._id_order = None
+        for employee in employees:
+            self.append(employee)
+        self.seal()
+
+    @classmethod
+    def from_parts(cls, table, indexes, name_grams, sorted_names, sorted_name_rows, deleted=()):
+        """
+        Wraps prebuilt, read-only structures (e.g. memory-mapped from a
+        snapshot) without re-indexing. Postings only need to be sorted,
+        indexable sequences of row ids, as do the sorted name arrays.
+        """
+        partition = cls.__new__(cls)
+        partition.table = table
+        partition.indexes = indexes
+        partition.name_grams = name_grams
+        partition.sorted_names = sorted_names
+        partition.sorted_name_rows = sorted_name_rows
+        partition.deleted = set(deleted)
+        partition.version = next(_versions)
+        partition.revision = None
+        partition._id_rows = None
+        partition._id_order = None
+        return partition
+
+    def copy(self) -> "OrgPartition":
+        """
+        Returns a private, writable copy of the partition. Memory-mapped
+        structures are materialized into regular arrays and lists.
+        """
+        partition = OrgPartition.from_parts(
+            table=self.table.copy(),
+            indexes={
+                field: defaultdict(_new_posting, {value: array("I", row_ids) for value, row_ids in index.items()})
+                for field, index in self.indexes.items()
+            },
+            name_grams=defaultdict(
+                _new_posting, {gram: array("I", row_ids) for gram, row_ids in self.name_grams.items()}
+            ),
+            sorted_names=list(self.sorted_names),
+            sorted_name_rows=array("I", self.sorted_name_rows),
+            deleted=self.deleted,
+        )
+        if self._id_rows is not None:
+            partition._id_rows = dict(self._id_rows)
+        return partition
+
+    def compacted(self) -> "OrgPartition":
+        """
+        Returns the partition rebuilt without tombstoned rows, or itself when
+        nothing has been deleted.
+        """
+        if not self.deleted:
+            return self
+        return OrgPartition(self.rows(self.all_rows()))
+
+    def append(self, employee) -> int:
+        """
+        Appends `employee` and indexes it. Prefix lookups only see the new row
+        after `seal` has rebuilt the sorted name array.
+        """
+        row_id = self.table.append(employee)
+        self._index_row(row_id)
+        self._id_order = None
+        if self._id_rows is not None:
+            self._id_rows[employee.id] = row_id
+        return row_id
+
+    def seal(self):
+        entries = sorted(
+            (name, row_id)
+            for row_id in self.all_rows()
+            for name in (self.table.folded_first_names[row_id], self.table.folded_last_names[row_id])
+        )
+        self.sorted_names = [name for name, _ in entries]
+        self.sorted_name_rows = array("I", (row_id for _, row_id in entries))
+
+    def upsert(self, employee):
+        """
+        Inserts `employee`, or updates the row with the same id in place so it
+        keeps its position. Indexes are maintained incrementally.
+        """
+        row_id = self.row_of(employee.id)
+        if row_id is None:
+            row_id = self.append(employee)
+        else:
+            self._unindex_row(row_id)
+            self.table.update(row_id, employee)
+            self._index_row(row_id)
+            self._id_order = None
+        self._insert_sorted_names(row_id)
+
+    def delete(self, employee_id: int) -> bool:
+        row_id = self.row_of(employee_id)
+        if row_id is None:
+            return False
+        self._unindex_row(row_id)
+        self.deleted.add(row_id)
+        self._id_order = None
+        del self._id_rows[employee_id]
+        return True
+
+    def row_of(self, employee_id: int):
+        if self._id_rows is None:
+            ids = self.table.ids
+            self._id_rows = {ids[row_id]: row_id for row_id in self.all_rows()}
+        return self._id_rows.get(employee_id)
+
+    def _row_grams(self, row_id: int) -> set:
+        table = self.table
+        return _ngrams(table.folded_first_names[row_id]) | _ngrams(table.folded_last_names[row_id])
+
+    def _index_row(self, row_id: int):
+        table = self.table
+        for field in INDEXED_FIELDS:
+            _add(self.indexes[field], table.folded[field][table.codes[field][row_id]], row_id)
+        name_grams = self.name_grams
+        for gram in self._row_grams(row_id):
+            _add(name_grams, gram, row_id)
+
+    def _unindex_row(self, row_id: int):
+        table = self.table
+        for field in INDEXED_FIELDS:
+            _discard(self.indexes[field], table.folded[field][table.codes[field][row_id]], row_id)
+        for gram in self._row_grams(row_id):
+            _discard(self.name_grams, gram, row_id)
+        for name in {table.folded_first_names[row_id], table.folded_last_names[row_id]}:
+            position = self._sorted_name_position(name, row_id)
+            while position < len(self.sorted_names) and self.sorted_names[position] == name:
+                if self.sorted_name_rows[position] == row_id:
+                    del self.sorted_names[position]
+                    del self.sorted_name_rows[position]
+                else:
+                    position += 1
+
+    def _sorted_name_position(self, name: str, row_id: int) -> int:
+        position = bisect_left(self.sorted_names, name)
+        while (position < len(self.sorted_names) and self.sorted_names[position] == name
+               and self.sorted_name_rows[position] < row_id):
+            position += 1
+        return position
+
+    def _insert_sorted_names(self, row_id: int):
+        for name in (self.table.folded_first_names[row_id], self.table.folded_last_names[row_id]):
+            position = self._sorted_name_position(name, row_id)
+            self.sorted_names.insert(position, name)
+            self.sorted_name_rows.insert(position, row_id)
+
+    def __len__(self):
+        return len(self.table) - len(self.deleted)
+
+    def all_rows(self):
+        """
+        Returns the live row ids in load order.
+        """
+        if not self.deleted:
+            return range(len(self.table))
+        return [row_id for row_id in range(len(self.table)) if row_id not in self.deleted]
+
+    def is_indexed(self, field: str) -> bool:
+        return field in self.indexes
+
+    def lookup(self, field: str, values) -> set:
+        """
+        Returns the row ids whose `field` matches any of the lowercased
+        `values`, as a new set merged from their postings.
+        """
+        index = self.indexes[field]
+        row_ids = set()
+        for value in values:
+            row_ids.update(index.get(value, ()))
+        return row_ids
+
+    def search_names(self, term: str) -> set:
+        """
+        Returns the row ids whose lowercased first or last name contains `term`.
+
+        Candidates come from intersecting the n-gram posting lists of `term`
+        and are then verified with a substring check, so the result matches
+        a full scan exactly. Terms shorter than NGRAM_SIZE scan the
+        precomputed lowercased names instead.
+        """
+        if len(term) < NGRAM_SIZE:
+            candidates = self.all_rows()
+        else:
+            candidates = _intersect(self.name_grams.get(gram, ()) for gram in _ngrams(term))
+        return self.scan_names(term, candidates)
+
+    def scan_names(self, term: str, candidates) -> set:
+        """
+        Returns the row ids among `candidates` whose lowercased first or last
+        name contains `term`.
+        """
+        first_names = self.table.folded_first_names
+        last_names = self.table.folded_last_names
+        return {
+            row_id for row_id in candidates
+            if term in first_names[row_id] or term in last_names[row_id]
+        }
+
+    def scan(self, field: str, values, candidates) -> set:
+        """
+        Returns the row ids among `candidates` whose `field` matches any of
+        the lowercased `values`, by checking each row instead of an index.
+        """
+        table = self.table
+        if field in table.codes:
+            codes, folded = table.codes[field], table.folded[field]
+            return {row_id for row_id in candidates if folded[codes[row_id]] in values}
+        return {row_id for row_id in candidates if table.value(field, row_id).lower() in values}
+
+    def estimate(self, field: str, values) -> int:
+        """
+        Returns an upper bound on the rows matching `field` in `values`, read
+        from the posting list sizes of indexed fields. Unindexed fields have
+        no statistics and are estimated to match every row.
+        """
+        if field not in self.indexes:
+            return len(self)
+        index = self.indexes[field]
+        return sum(len(index.get(value, ())) for value in values)
+
+    def estimate_names(self, term: str) -> int:
+        """
+        Returns an upper bound on the rows whose name contains `term`: the
+        size of its rarest n-gram posting list.
+        """
+        if len(term) < NGRAM_SIZE:
+            return len(self)
+        return min(len(self.name_grams.get(gram, ())) for gram in _ngrams(term))
+
+    def facet_counts(self, field: str, row_ids=None) -> dict:
+        """
+        Returns `{value: count}` for the indexed `field` over every live row,
+        or over `row_ids` when given, without materializing any Employee.
+
+        Whole-partition counts are the posting list sizes; filtered counts
+        tally the dictionary codes of the matched rows. Values that differ
+        only by case are counted together under their first spelling.
+        """
+        table = self.table
+        if row_ids is None:
+            counts = {key: len(rows) for key, rows in self.indexes[field].items() if len(rows)}
+        else:
+            codes, folded = table.codes[field], table.folded[field]
+            counts = Counter()
+            for code, count in Counter(codes[row_id] for row_id in row_ids).items():
+                counts[folded[code]] += count
+
+        labels = {}
+        for value, key in zip(table.dictionaries[field], table.folded[field]):
+            labels.setdefault(key, value)
+        return {labels[key]: count for key, count in sorted(counts.items(), key=lambda item: (-item[1], item[0]))}
+
+    def prefix_search(self, prefix: str, limit: int) -> list:
+        """
+        Returns up to `limit` row ids whose lowercased first or last name starts
+        with `prefix`, ordered by the matching name.
+
+        Uses bisect on the sorted name array, so the cost is O(log n + limit)
+        regardless of partition size.
+        """
+        row_ids = []
+        seen = set()
+        position = bisect_left(self.sorted_names, prefix)
+        while position < len(self.sorted_names) and len(row_ids) < limit:
+            if not self.sorted_names[position].startswith(prefix):
+                break
+            row_id = self.sorted_name_rows[position]
+            if row_id not in seen:
+                seen.add(row_id)
+                row_ids.append(row_id)
+            position += 1
+        return row_ids
+
+    def id_order(self):
+        """
+        Returns `(row_ids, ids)`: the live row ids sorted by employee id and
+        the matching ids, computed once per partition version.
+        """
+        if self._id_order is None:
+            ids = self.table.ids
+            row_ids = array("I", sorted(self.all_rows(), key=ids.__getitem__))
+            self._id_order = (row_ids, array("q", (ids[row_id] for row_id in row_ids)))
+        return self._id_order
+
+    def rows_after(self, last_id, limit: int, matched=None) -> list:
+        """
+        Returns up to `limit` row ids in employee-id order, starting after
+        `last_id` (None starts from the beginning) and restricted to `matched`
+        when given. Generation stops as soon as `limit` rows are found.
+        """
+        ids = self.table.ids
+        if matched is not None and len(matched) * 8 < len(self):
+            # Small result sets: order the matches directly
+            return heapq.nsmallest(
+                limit,
+                (row_id for row_id in matched if last_id is None or ids[row_id] > last_id),
+                key=ids.__getitem__,
+            )
+
+        row_ids, sorted_ids = self.id_order()
+        position = 0 if last_id is None else bisect_right(sorted_ids, last_id)
+        result = []
+        while position < len(row_ids) and len(result) < limit:
+            row_id = row_ids[position]
+            if matched is None or row_id in matched:
+                result.append(row_id)
+            position += 1
+        return result
+
+    def iter_id_order(self, matched=None):
+        """
+        Returns an iterable of the row ids in employee-id order, restricted
+        to `matched` when given. Small match sets are sorted directly instead
+        of walking the whole partition.
+        """
+        if matched is not None and len(matched) * 8 < len(self):
+            return sorted(matched, key=self.table.ids.__getitem__)
+        row_ids, _ = self.id_order()
+        if matched is None:
+            return row_ids
+        return (row_id for row_id in row_ids if row_id in matched)
+
+    def rows(self, row_ids):
+        """
+        Materializes Employee objects for `row_ids`, in the given order.
+        """
+        return [self.table.row(row_id) for row_id in row_ids]
+
+
+class StoreView:
+    """
+    Immutable, versioned view of the store's organizations and partitions.
+    Every published view gets a new, strictly increasing version.
+
+    Readers take one view per request and keep using it, so they see a
+    consistent dataset even while writers publish newer versions.
+
+    `version` is local to the process. `dataset` identifies the loaded
+    content across processes and restarts (the fingerprint of the source
+    data); what was written since is tracked per partition, see
+    OrgPartition.revision.
+    """
+
+    __slots__ = ("version", "organizations", "partitions", "dataset")
+
+    def __init__(self, version: int, organizations: dict, partitions: dict, dataset: str = ""):
+        self.version = version
+        self.organizations = organizations
+        self.partitions = partitions
+        self.dataset = dataset
+
+    def get_organization(self, organization_id: int):
+        return self.organizations.get(organization_id)
+
+    def get_partition(self, organization_id: int) -> OrgPartition:
+        return self.partitions.get(organization_id) or _EMPTY_PARTITION
+
+
+# Shared by every organization without employees so its version, and with it
+# the org's cache entries and ETags, stay stable. Never written to.
+_EMPTY_PARTITION = OrgPartition()
+
+
+class EmployeeStore:
+    """
+    In-memory employee store partitioned by organization.
+
+    Organizations are keyed by id and employees are grouped into one
+    OrgPartition per organization_id. Both are built in a single pass at load
+    time so that org lookup and fetching an org's partition are O(1) per
+    request. Organizations are consumed before employees, so both arguments
+    may be generators.
+
+    Writes are copy-on-write: a writer copies every partition it touches,
+    updates the copy's indexes and publishes a new StoreView with a single
+    reference swap. Readers never take a lock. A write therefore costs
+    O(rows of the touched organizations), not O(rows written); only the
+    written partitions get a new version, so other organizations keep their
+    cached results and ETags.
+
+    Writes only change this process's store. When `read_only` holds a reason
+    (the data is shared with other workers), every write raises
+    PermissionError instead of letting workers silently diverge.
+
+    Args:
+        employees (iterable): Employee records to load.
+        organizations (iterable): Organization records to load.
+        fingerprint (str): Identity of the loaded data, e.g. a digest of the
+            source files. Computed from the records when omitted.
+    """
+
+    def __init__(self, employees=(), organizations=(), fingerprint: str = None):
+        digest = hashlib.blake2b(digest_size=16) if fingerprint is None else None
+        organizations = {org.id: org for org in organizations}
+        partitions = {}
+        for employee in employees:
+            partition = partitions.get(employee.organization_id)
+            if partition is None:
+                partition = partitions[employee.organization_id] = OrgPartition()
+            partition.append(employee)
+            if digest is not None:
+                digest.update(repr(employee).encode("utf-8"))
+        for partition in partitions.values():
+            partition.seal()
+        if digest is not None:
+            digest.update(repr(sorted((org.id, org.name) for org in organizations.values())).encode("utf-8"))
+            fingerprint = digest.hexdigest()
+        self.fingerprint = fingerprint
+        self._view = StoreView(next(_versions), organizations, partitions, fingerprint)
+        self._write_lock = threading.Lock()
+        self._employee_orgs = None
+        self.read_only = None
+
+    @classmethod
+    def from_snapshot(cls, path: str) -> "EmployeeStore":
+        """
+        Opens a store over a memory-mapped snapshot written by
+        `app.common.snapshot.write_snapshot`, without parsing or re-indexing.
+        """
+        organizations, partitions, digest = read_snapshot(path)
+        store = cls(organizations=organizations, fingerprint=digest)
+        store._view = StoreView(next(_versions), store.organizations, {
+            org_id: OrgPartition.from_parts(**parts) for org_id, parts in partitions.items()
+        }, digest)
+        logger.info(f"Opened snapshot {path} with {len(store)} employees")
+        return store
+
+    def __len__(self):
+        return sum(len(partition) for partition in self.partitions.values())
+
+    def view(self) -> StoreView:
+        return self._view
+
+    @property
+    def version(self) -> int:
+        return self._view.version
+
+    @property
+    def organizations(self) -> dict:
+        return self._view.organizations
+
+    @property
+    def partitions(self) -> dict:
+        return self._view.partitions
+
+    def get_organization(self, organization_id: int):
+        return self._view.get_organization(organization_id)
+
+    def get_partition(self, organization_id: int) -> OrgPartition:
+        return self._view.get_partition(organization_id)
+
+    def _employee_index(self) -> dict:
+        # employee id -> organization id, built on the first write
+        if self._employee_orgs is None:
+            self._employee_orgs = {
+                partition.table.ids[row_id]: org_id
+                for org_id, partition in self.partitions.items()
+                for row_id in partition.all_rows()
+            }
+        return self._employee_orgs
+
+    def _check_writable(self):
+        if self.read_only:
+            raise PermissionError(f"Writes are disabled: {self.read_only}")
+
+    def _publish(self, organizations: dict, partitions: dict, touched) -> int:
+        for org_id in touched:
+            partition = partitions.get(org_id)
+            if partition is None:
+                continue
+            if len(partition.deleted) > len(partition.table) // 2:
+                partition = partitions[org_id] = partition.compacted()
+            partition.version = next(_versions)
+            partition.revision = f"{_PROCESS_ID}:{partition.version}"
+        self._view = StoreView(next(_versions), organizations, partitions, self.fingerprint)
+        return self._view.version
+
+    def upsert_employees(self, employees) -> int:
+        """
+        Inserts or updates `employees` (matched by id) and returns the new
+        dataset version. An employee whose organization_id changed is moved
+        to the new organization's partition.
+
+        Raises:
+            ValueError: If an employee references an unknown organization.
+            PermissionError: If the store is read-only.
+        """
+        employees = list(employees)
+        self._check_writable()
+        with self._write_lock:
+            view = self._view
+            unknown = sorted({e.organization_id for e in employees} - view.organizations.keys())
+            if unknown:
+                raise ValueError(f"Unknown organization ID(s): {', '.join(map(str, unknown))}")
+
+            employee_orgs = self._employee_index()
+            partitions = dict(view.partitions)
+            copied = {}
+
+            def writable(org_id):
+                if org_id not in copied:
+                    partition = partitions.get(org_id)
+                    copied[org_id] = partition.copy() if partition is not None else OrgPartition()
+                    partitions[org_id] = copied[org_id]
+                return copied[org_id]
+
+            for employee in employees:
+                previous_org = employee_orgs.get(employee.id)
+                if previous_org is not None and previous_org != employee.organization_id:
+                    writable(previous_org).delete(employee.id)
+                writable(employee.organization_id).upsert(employee)
+                employee_orgs[employee.id] = employee.organization_id
+
+            return self._publish(view.organizations, partitions, copied)
+
+    def delete_employee(self, employee_id: int) -> bool:
+        self._check_writable()
+        with self._write_lock:
+            view = self._view
+            org_id = self._employee_index().pop(employee_id, None)
+            if org_id is None:
+                return False
+            partitions = dict(view.partitions)
+            partitions[org_id] = partitions[org_id].copy()
+            partitions[org_id].delete(employee_id)
+            self._publish(view.organizations, partitions, [org_id])
+            return True
+
+    def upsert_organizations(self, organizations) -> int:
+        self._check_writable()
+        with self._write_lock:
+            view = self._view
+            merged = dict(view.organizations)
+            merged.update((org.id, org) for org in organizations)
+            return self._publish(merged, view.partitions, [])
+
+    def delete_organization(self, organization_id: int) -> bool:
+        """
+        Removes the organization together with all of its employees.
+        """
+        self._check_writable()
+        with self._write_lock:
+            view = self._view
+            if organization_id not in view.organizations:
+                return False
+            organizations = dict(view.organizations)
+            del organizations[organization_id]
+            partitions = dict(view.partitions)
+            removed = partitions.pop(organization_id, None)
+            if removed is not None and self._employee_orgs is not None:
+                for row_id in removed.all_rows():
+                    self._employee_orgs.pop(removed.table.ids[row_id], None)
+            self._publish(organizations, partitions, [])
+            return True
+
+
+def load_store(employees_path: str, organizations_path: str) -> EmployeeStore:
+    """
+    Streams organizations and employees from CSV/JSONL files into a new store
+    and logs the load throughput.
+    """
+    started = time.perf_counter()
+    store = EmployeeStore(
+        iter_employees(employees_path), iter_organizations(organizations_path),
+        fingerprint=file_digest(employees_path, organizations_path),
+    )
+    elapsed = time.perf_counter() - started
+    rows = len(store)
+    logger.info(
+        f"Loaded {rows} employees for {len(store.organizations)} organizations "
+        f"in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)"
+    )
+    return store
+
+
+def _read_only_reason():
+    # Writes are not propagated between processes, so a store shared by
+    # several workers must not accept them
+    if os.getenv(EMPLOYEE_SNAPSHOT_PATH_ENV):
+        return "the data is served from a snapshot shared by every worker"
+    if int(os.getenv(WEB_CONCURRENCY_ENV) or 1) > 1:
+        return "the API runs with several workers, which would not see each other's writes"
+    return None
+
+
+def _load_default_store() -> EmployeeStore:
+    snapshot_path = os.getenv(EMPLOYEE_SNAPSHOT_PATH_ENV)
+    employees_path = os.getenv(EMPLOYEES_DATA_PATH_ENV)
+    organizations_path = os.getenv(ORGANIZATIONS_DATA_PATH_ENV)
+    if snapshot_path:
+        store = EmployeeStore.from_snapshot(snapshot_path)
+    elif employees_path and organizations_path:
+        store = load_store(employees_path, organizations_path)
+    else:
+        store = EmployeeStore(employees, organizations)
+    store.read_only = _read_only_reason()
+    if store.read_only:
+        logger.info(f"Employee writes disabled: {store.read_only}")
+    return store
+
+
+employee_store = _load_default_store()
@@ -0,0 +1,128 @@
+import sys
+from array import array
+from dataclasses import fields
+from app.common.constant import CATEGORICAL_FIELDS
+from app.models.employee import Employee
+
+EMPLOYEE_FIELDS = tuple(f.name for f in fields(Employee))
+
+
+class EmployeeTable:
+    """
+    Columnar in-memory representation of Employee records.
+
+    Ids live in a typed array and free-text fields in plain lists. Fields in
+    CATEGORICAL_FIELDS are dictionary-encoded: each row stores a small integer
+    code, and the distinct values are interned once with a precomputed
+    lowercased shadow. Employee objects are only materialized on demand via
+    `row`.
+
+    Args:
+        employees (iterable): Employee records to load.
+    """
+
+    def __init__(self, employees=()):
+        self.ids = array("q")
+        self.columns = {"id": self.ids, "first_name": [], "last_name": [], "contact_info": []}
+        self.folded_first_names = []
+        self.folded_last_names = []
+        self.codes = {field: array("I") for field in CATEGORICAL_FIELDS}
+        self.dictionaries = {field: [] for field in CATEGORICAL_FIELDS}
+        self.folded = {field: [] for field in CATEGORICAL_FIELDS}
+        self._encodings = {field: {} for field in CATEGORICAL_FIELDS}
+        for employee in employees:
+            self.append(employee)
+
+    @classmethod
+    def from_columns(cls, ids, columns, folded_first_names, folded_last_names, codes, dictionaries, folded):
+        """
+        Wraps prebuilt, read-only columns (e.g. memory-mapped from a snapshot).
+        Columns only need to be indexable sequences; the table cannot be
+        appended to.
+        """
+        table = cls.__new__(cls)
+        table.ids = ids
+        table.columns = {"id": ids, **columns}
+        table.folded_first_names = folded_first_names
+        table.folded_last_names = folded_last_names
+        table.codes = codes
+        table.dictionaries = dictionaries
+        table.folded = folded
+        table._encodings = None
+        return table
+
+    def copy(self) -> "EmployeeTable":
+        """
+        Returns a writable deep copy, materializing read-only columns.
+        """
+        table = EmployeeTable.from_columns(
+            ids=array("q", self.ids),
+            columns={name: list(values) for name, values in self.columns.items() if name != "id"},
+            folded_first_names=list(self.folded_first_names),
+            folded_last_names=list(self.folded_last_names),
+            codes={field: array("I", codes) for field, codes in self.codes.items()},
+            dictionaries={field: list(values) for field, values in self.dictionaries.items()},
+            folded={field: list(values) for field, values in self.folded.items()},
+        )
+        table._encodings = {
+            field: {value: code for code, value in enumerate(values)}
+            for field, values in table.dictionaries.items()
+        }
+        return table
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _encode(self, field: str, value) -> int:
+        encoding = self._encodings[field]
+        code = encoding.get(value)
+        if code is None:
+            if isinstance(value, str):
+                value = sys.intern(value)
+            code = len(self.dictionaries[field])
+            encoding[value] = code
+            self.dictionaries[field].append(value)
+            self.folded[field].append(value.lower() if isinstance(value, str) else value)
+        return code
+
+    def append(self, employee) -> int:
+        """
+        Appends `employee` as a new row and returns its row id.
+        """
+        row_id = len(self.ids)
+        self.ids.append(employee.id)
+        self.columns["first_name"].append(employee.first_name)
+        self.columns["last_name"].append(employee.last_name)
+        self.columns["contact_info"].append(employee.contact_info)
+        self.folded_first_names.append(employee.first_name.lower())
+        self.folded_last_names.append(employee.last_name.lower())
+        for field in CATEGORICAL_FIELDS:
+            self.codes[field].append(self._encode(field, getattr(employee, field)))
+        return row_id
+
+    def update(self, row_id: int, employee):
+        """
+        Overwrites row `row_id` with `employee` in place.
+        """
+        self.ids[row_id] = employee.id
+        self.columns["first_name"][row_id] = employee.first_name
+        self.columns["last_name"][row_id] = employee.last_name
+        self.columns["contact_info"][row_id] = employee.contact_info
+        self.folded_first_names[row_id] = employee.first_name.lower()
+        self.folded_last_names[row_id] = employee.last_name.lower()
+        for field in CATEGORICAL_FIELDS:
+            self.codes[field][row_id] = self._encode(field, getattr(employee, field))
+
+    def has_field(self, field: str) -> bool:
+        return field in self.columns or field in self.codes
+
+    def code(self, field: str, row_id: int) -> int:
+        return self.codes[field][row_id]
+
+    def value(self, field: str, row_id: int):
+        if field in self.codes:
+            return self.dictionaries[field][self.codes[field][row_id]]
+        return self.columns[field][row_id]
+
+    def row(self, row_id: int) -> Employee:
+        return Employee(*(self.value(field, row_id) for field in EMPLOYEE_FIELDS))
@@ -1,88 +1,441 @@
+import base64
+import hashlib
+import heapq
+import json
+from dataclasses import asdict
 from fastapi import HTTPException
-from app.employee_data.employee_data import employees, organizations
+from app.common.constant import (
+    INDEXED_FIELDS, NEGATED_FILTER_PREFIX, SEARCH_COST_BASE, SEARCH_COST_ROWS_PER_UNIT,
+)
+from app.common.employee_store import employee_store
 from app.config.organization_fields_config import org_column_config
 from app.common.logging_config import get_json_logger, log_json_exceptions
+from app.common.metrics import stage
+from app.common.profiling import profile_requests
+from app.common.query_cache import query_cache
+from app.common.serializers import encode_results, iter_ndjson
 
 logger = get_json_logger()
 
+
+def encode_cursor(organization_id: int, last_id: int) -> str:
+    payload = json.dumps({"org": organization_id, "after": last_id}).encode()
+    return base64.urlsafe_b64encode(payload).decode()
+
+
+def decode_cursor(cursor: str, organization_id: int):
+    """
+    Returns the employee id to resume after, or None for an empty cursor.
+    """
+    if not cursor:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        if payload["org"] != organization_id:
+            raise ValueError("cursor belongs to another organization")
+        return int(payload["after"])
+    except (ValueError, KeyError, TypeError) as e:
+        logger.error(f"Invalid cursor: {cursor} ({e})")
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def split_filter_key(key: str) -> tuple:
+    """
+    Returns `(field, negated)` for a filter key: `not_department` excludes
+    the listed departments, `department` keeps only them.
+    """
+    if key.startswith(NEGATED_FILTER_PREFIX):
+        return key[len(NEGATED_FILTER_PREFIX):], True
+    return key, False
+
+
+def filter_values(value: str) -> frozenset:
+    """
+    Returns the lowercased values a filter lists; every categorical filter
+    accepts a comma-separated IN-list.
+    """
+    return frozenset(v.strip().lower() for v in value.split(","))
+
+
+def estimate_rows(partition, field: str, values, negated: bool) -> int:
+    """
+    Returns an upper bound on the rows a filter step keeps. Posting sizes
+    are exact, so an exclusion keeps the partition minus its postings.
+    """
+    if negated and partition.is_indexed(field):
+        return len(partition) - partition.estimate(field, values)
+    return partition.estimate(field, values)
+
+
+def estimate_cost(partition, filters: dict) -> float:
+    """
+    Estimates the work of running `filters` on `partition` in cost units of
+    SEARCH_COST_ROWS_PER_UNIT rows, plus SEARCH_COST_BASE per request.
+
+    The planner starts from its most selective step and every later step
+    touches at most that many rows, so the estimate is the smallest step
+    estimate times the number of steps; without filters it is the whole
+    partition. Unknown fields are ignored here and rejected by the search.
+    """
+    estimates = []
+    for key, value in filters.items():
+        field, negated = split_filter_key(key)
+        if key == "search":
+            estimates.append(partition.estimate_names(value.lower()))
+        elif partition.table.has_field(field):
+            estimates.append(estimate_rows(partition, field, filter_values(value), negated))
+    rows = min(estimates) * len(estimates) if estimates else len(partition)
+    return SEARCH_COST_BASE + rows / SEARCH_COST_ROWS_PER_UNIT
+
+
 class EmployeeSearchService:
-    def __init__(self, organization_id: int, filters: dict):
+    """
+    Filters, paginates and formats one organization's employees.
+
+    Args:
+        organization_id (int): Organization to search.
+        filters (dict): Field filters plus an optional "search" term.
+        view (StoreView): Snapshot to search; defaults to the current one.
+        lookups (dict): Optional memo of index lookups shared by several
+            services reading the same view, e.g. the queries of one batch.
+    """
+
+    def __init__(self, organization_id: int, filters: dict, view=None, lookups=None):
         self.organization_id = organization_id
         self.filters = filters
-        self.org = self._validate_organization()
-        self.employees = self._get_employees_for_org()
+        self.view = view if view is not None else employee_store.view()
+        self.lookups = {} if lookups is None else lookups
+        with stage("org_validation", organization_id):
+            self.org = self._validate_organization()
+            self.partition = self._get_partition_for_org()
+        self.table = self.partition.table
 
     def _validate_organization(self):
-        org = next((o for o in organizations if o.id == self.organization_id), None)
+        org = self.view.get_organization(self.organization_id)
         if not org:
             logger.error(f"Organization not found: {self.organization_id}")
             raise HTTPException(
                 status_code=404, detail=f"Invalid organization ID: {self.organization_id}"
             )
-        logger.info(f"Organization validated: {org.name} (ID: {org.id})")
+        logger.info("Organization validated: %s (ID: %s)", org.name, org.id)
         return org
 
-    def _get_employees_for_org(self):
-        org_employees = [e for e in employees if e.organization_id == self.organization_id]
-        logger.info(f"Found {len(org_employees)} employees for org ID {self.organization_id}")
-        return org_employees
+    def _get_partition_for_org(self):
+        partition = self.view.get_partition(self.organization_id)
+        logger.info("Found %s employees for org ID %s", len(partition), self.organization_id)
+        return partition
 
-    def _apply_filters(self):
-        result = self.employees
+    def _lookup(self, field: str, values):
+        # Memoized per view: the returned sets are shared, so callers must
+        # never mutate them
+        memo_key = (self.organization_id, field, values)
+        row_ids = self.lookups.get(memo_key)
+        if row_ids is None:
+            if field == "search":
+                row_ids = self.partition.search_names(values)
+            else:
+                row_ids = self.partition.lookup(field, values)
+            self.lookups[memo_key] = row_ids
+        return row_ids
 
-        # Handle name search first
+    def _plan(self):
+        """
+        Returns the filter steps ordered by estimated selectivity, most
+        selective first, as `(key, values, raw_value, estimate)` tuples.
+        The name search is the "search" step with the lowercased term as its
+        value; `not_<field>` keys are exclusions.
+        """
+        steps = []
         search_term = self.filters.pop("search", None)
         if search_term:
-            search_term_lower = search_term.lower()
-            result = [
-                e for e in result
-                if search_term_lower in e.first_name.lower() or search_term_lower in e.last_name.lower()
-            ]
-            if not result:
-                logger.warning(f"No employees found matching search: {search_term}")
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"No employees found matching search: '{search_term}'"
-                )
+            term = search_term.lower()
+            steps.append(("search", term, search_term, self.partition.estimate_names(term)))
 
         for key, value in self.filters.items():
-            if not hasattr(result[0], key):
+            field, negated = split_filter_key(key)
+            if not self.table.has_field(field):
                 logger.error(f"Invalid filter field: {key}")
                 raise HTTPException(
                     status_code=400, detail=f"Invalid filter field: {key}"
                 )
 
-            if key == "status":
-                values = [v.strip().lower() for v in value.split(",")]
-                result = [e for e in result if getattr(e, key, "").lower() in values]
+            values = filter_values(value)
+            steps.append((key, values, value, estimate_rows(self.partition, field, values, negated)))
+
+        # Stable sort: equally selective filters keep their request order
+        steps.sort(key=lambda step: step[3])
+        return steps
+
+    def _execute_plan(self, steps):
+        """
+        Runs the planned steps, narrowing the candidate set as it goes and
+        stopping at the first step that leaves no rows. Each step either
+        looks its rows up in an index or, when the candidates are already
+        fewer than the estimated matches (or the field has no index), checks
+        the candidates directly. An IN-list is the union of its values'
+        postings; an exclusion subtracts that union from the candidates.
+
+        Returns:
+            tuple: (row_ids, failed_step) where row_ids is None for "every
+            live row" and failed_step is the step that emptied the result.
+            The chosen strategy and row count of each step are recorded in
+            `self.plan`.
+        """
+        row_ids = None
+        self.plan = []
+        for step in steps:
+            key, values, raw_value, estimate = step
+            field, negated = split_filter_key(key)
+            indexed = field == "search" or self.partition.is_indexed(field)
+            # Rows the step's values match, which is what a lookup costs
+            matches = len(self.partition) - estimate if negated and indexed else estimate
+            if indexed and (row_ids is None or matches <= len(row_ids)):
+                strategy = "index"
+                matched = self._lookup(field, values)
+                if negated:
+                    candidates = set(self.partition.all_rows()) if row_ids is None else row_ids
+                    row_ids = candidates - matched
+                else:
+                    row_ids = matched if row_ids is None else row_ids & matched
             else:
-                result = [e for e in result if getattr(e, key, "").lower() == value.lower()]
+                strategy = "scan"
+                candidates = self.partition.all_rows() if row_ids is None else row_ids
+                if field == "search":
+                    row_ids = self.partition.scan_names(values, candidates)
+                elif negated:
+                    row_ids = set(candidates) - self.partition.scan(field, values, candidates)
+                else:
+                    row_ids = self.partition.scan(field, values, candidates)
+
+            self.plan.append({
+                "field": key,
+                "value": raw_value,
+                "estimate": estimate,
+                "strategy": strategy,
+                "rows": len(row_ids),
+            })
+            if not row_ids:
+                return row_ids, step
+        return row_ids, None
+
+    def _apply_filters(self):
+        # None means "every live row of the partition"; otherwise the unordered
+        # set of matching row ids is returned and ordered only when paginating
+        with stage("filter", self.organization_id):
+            row_ids, failed_step = self._execute_plan(self._plan())
+        logger.debug("Query plan for org ID %s: %s", self.organization_id, self.plan)
 
-            if not result:
-                logger.warning(f"No employees found for filter: {key} = '{value}'")
+        if failed_step is not None:
+            field, _, raw_value, _ = failed_step
+            if field == "search":
+                logger.warning(f"No employees found matching search: {raw_value}")
                 raise HTTPException(
                     status_code=404,
-                    detail=f"No employees found for filter: {key} = '{value}'",
+                    detail=f"No employees found matching search: '{raw_value}'"
                 )
-        return result
+            logger.warning(f"No employees found for filter: {field} = '{raw_value}'")
+            raise HTTPException(
+                status_code=404,
+                detail=f"No employees found for filter: {field} = '{raw_value}'",
+            )
+
+        return row_ids
 
     def _format_output(self, filtered_employees):
         columns = org_column_config.get(self.organization_id)
         if not columns:
-            return [e.__dict__ for e in filtered_employees]
+            return [asdict(e) for e in filtered_employees]
         return [
             {col: getattr(e, col) for col in columns if hasattr(e, col)}
             for e in filtered_employees
         ]
 
-    @log_json_exceptions
-    def run(self, page: int, page_size: int):
-        filtered = self._apply_filters()
-        total = len(filtered)
+    def _cache_key(self, *pagination):
+        # Filters normalized the same way _apply_filters compares them, plus
+        # the org's projection so config changes never serve stale columns
+        normalized = []
+        for key, value in self.filters.items():
+            if key == "search":
+                value = value.lower()
+            else:
+                value = ",".join(sorted(filter_values(value)))
+            normalized.append((key, value))
+        columns = tuple(org_column_config.get(self.organization_id) or ())
+        return (self.organization_id, tuple(sorted(normalized)), columns, *pagination)
 
+    def etag(self, *query) -> str:
+        """
+        Returns a strong ETag for the response to this service's filters and
+        `query` (the pagination or response kind). It is derived from the
+        dataset identity, the revision of the org's partition, the org's
+        column config and the normalized filters only, so it can be checked
+        without filtering or serializing. Unlike versions, these are the same
+        for the same data in every process and differ for different data, and
+        a write to another organization leaves them unchanged. Must be called
+        before the filters are applied.
+        """
+        key = repr((self.view.dataset, self.partition.revision, self._cache_key(*query))).encode()
+        return '"' + hashlib.blake2b(key, digest_size=16).hexdigest() + '"'
+
+    def _paginate(self, page: int, page_size: int):
+        """
+        Returns `(page_rows, total)` for offset pagination, served from the
+        query cache when possible.
+        """
+        cache_key = self._cache_key("page", page, page_size)
+        with stage("cache", self.organization_id):
+            cached = query_cache.get(self.organization_id, self.partition.version, cache_key)
+        if cached is not None:
+            logger.info("Returning cached page %s for org ID %s", page, self.organization_id)
+            return cached
+
+        row_ids = self._apply_filters()
         start = (page - 1) * page_size
         end = start + page_size
-        paginated_employees = filtered[start:end]
 
-        logger.info(f"Returning {len(paginated_employees)} out of {total} employees (Page {page})")
-        return self._format_output(paginated_employees), total
+        with stage("paginate", self.organization_id):
+            if row_ids is None:
+                all_rows = self.partition.all_rows()
+                total = len(all_rows)
+                page_rows = list(all_rows[start:end])
+            else:
+                # Only the first `end` matches need ordering, not the whole result
+                total = len(row_ids)
+                page_rows = heapq.nsmallest(end, row_ids)[start:]
+
+        logger.info("Returning %s out of %s employees (Page %s)", len(page_rows), total, page)
+        result = page_rows, total
+        query_cache.put(self.organization_id, self.partition.version, cache_key, result)
+        return result
+
+    def _paginate_cursor(self, cursor: str, page_size: int):
+        """
+        Keyset pagination ordered by employee id.
+
+        Resumes after the employee id encoded in `cursor` (an empty cursor
+        starts from the beginning) and stops as soon as `page_size` rows have
+        been produced, so deep pages cost the same as the first one.
+
+        Returns:
+            tuple: (page_rows, total, next_cursor) where next_cursor is None
+            on the last page.
+        """
+        last_id = decode_cursor(cursor, self.organization_id)
+        cache_key = self._cache_key("cursor", last_id, page_size)
+        with stage("cache", self.organization_id):
+            cached = query_cache.get(self.organization_id, self.partition.version, cache_key)
+        if cached is not None:
+            logger.info("Returning cached cursor page for org ID %s", self.organization_id)
+            return cached
+
+        row_ids = self._apply_filters()
+        total = len(self.partition) if row_ids is None else len(row_ids)
+
+        with stage("paginate", self.organization_id):
+            page_rows = self.partition.rows_after(last_id, page_size + 1, row_ids)
+            next_cursor = None
+            if len(page_rows) > page_size:
+                page_rows = page_rows[:page_size]
+                next_cursor = encode_cursor(self.organization_id, self.table.ids[page_rows[-1]])
+
+        logger.info("Returning %s out of %s employees (cursor)", len(page_rows), total)
+        result = page_rows, total, next_cursor
+        query_cache.put(self.organization_id, self.partition.version, cache_key, result)
+        return result
+
+    @profile_requests
+    @log_json_exceptions
+    def run(self, page: int, page_size: int):
+        page_rows, total = self._paginate(page, page_size)
+        with stage("serialize", self.organization_id):
+            return self._format_output(self.partition.rows(page_rows)), total
+
+    @profile_requests
+    @log_json_exceptions
+    def run_json(self, page: int, page_size: int) -> bytes:
+        """
+        Same as `run`, but returns the complete response body as JSON bytes
+        encoded by the org's compiled projection serializer.
+        """
+        page_rows, total = self._paginate(page, page_size)
+        with stage("serialize", self.organization_id):
+            return encode_results(
+                self.organization_id, self.partition, page_rows, page=page, page_size=page_size, total=total
+            )
+
+    @profile_requests
+    @log_json_exceptions
+    def run_cursor(self, cursor: str, page_size: int):
+        page_rows, total, next_cursor = self._paginate_cursor(cursor, page_size)
+        with stage("serialize", self.organization_id):
+            return self._format_output(self.partition.rows(page_rows)), total, next_cursor
+
+    @profile_requests
+    @log_json_exceptions
+    def run_cursor_json(self, cursor: str, page_size: int) -> bytes:
+        page_rows, total, next_cursor = self._paginate_cursor(cursor, page_size)
+        with stage("serialize", self.organization_id):
+            return encode_results(
+                self.organization_id, self.partition, page_rows,
+                page_size=page_size, total=total, next_cursor=next_cursor,
+            )
+
+    @log_json_exceptions
+    def facets(self) -> dict:
+        """
+        Returns the number of matching employees per value of every indexed
+        field, computed from index and code counts rather than rows.
+        """
+        cache_key = self._cache_key("facets")
+        cached = query_cache.get(self.organization_id, self.partition.version, cache_key)
+        if cached is not None:
+            logger.info("Returning cached facets for org ID %s", self.organization_id)
+            return cached
+
+        row_ids = self._apply_filters()
+        with stage("aggregate", self.organization_id):
+            result = {
+                "total": len(self.partition) if row_ids is None else len(row_ids),
+                "facets": {field: self.partition.facet_counts(field, row_ids) for field in INDEXED_FIELDS},
+            }
+        logger.info("Returning facets over %s employees", result["total"])
+        query_cache.put(self.organization_id, self.partition.version, cache_key, result)
+        return result
+
+    @log_json_exceptions
+    def export(self):
+        """
+        Applies the filters and returns a generator of NDJSON chunks with
+        every match in employee-id order.
+
+        Filtering runs eagerly so 400/404 errors are raised before a response
+        starts; rows are only encoded as the consumer pulls chunks. The
+        generator keeps reading the view it was created from, so a long
+        export sees one consistent version of the data.
+        """
+        row_ids = self._apply_filters()
+        ordered = self.partition.iter_id_order(row_ids)
+        total = len(self.partition) if row_ids is None else len(row_ids)
+        logger.info("Exporting %s employees for org ID %s", total, self.organization_id)
+        return iter_ndjson(self.organization_id, self.partition, ordered)
+
+    @log_json_exceptions
+    def explain(self) -> dict:
+        """
+        Plans and runs the filters without paginating and returns the chosen
+        plan with the row count after every step. Never served from or
+        stored in the query cache.
+        """
+        row_ids, _ = self._execute_plan(self._plan())
+        return {
+            "organization_id": self.organization_id,
+            "version": self.view.version,
+            "total": len(self.partition) if row_ids is None else len(row_ids),
+            "plan": self.plan,
+        }
+
+    @log_json_exceptions
+    def autocomplete(self, prefix: str, limit: int):
+        suggestions = self.partition.rows(self.partition.prefix_search(prefix.lower(), limit))
+        logger.info("Returning %s suggestions for prefix '%s'", len(suggestions), prefix)
+        return self._format_output(suggestions)
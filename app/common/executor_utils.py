@@ -0,0 +1,152 @@
+import asyncio
+import contextvars
+import heapq
+import itertools
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from fastapi import HTTPException
+from app.common.constant import (
+    SEARCH_EXECUTION_MODE, SEARCH_EXECUTION_MODE_ENV, SEARCH_MAX_QUEUE, SEARCH_MAX_WORKERS,
+    SEARCH_TIMEOUT_SECONDS, TENANT_WEIGHT,
+)
+from app.config.search_quota_config import org_search_quota_config
+from app.common.logging_config import get_json_logger
+
+logger = get_json_logger()
+
+
+class SearchExecutor:
+    """
+    Runs CPU-bound search work off the event loop with admission control.
+
+    In "thread" mode work runs on a bounded thread pool. At most
+    `max_workers` calls run at once and at most `max_queue` more wait. Further
+    calls are shed immediately with a 503 instead of growing an unbounded
+    queue. A call that does not finish within `timeout_seconds` gets a 504.
+    In "inline" mode work runs directly on the event loop.
+
+    Waiting calls are not served first-come first-served but by start-time
+    fair queuing over tenants: each call is tagged with a virtual start time
+    that advances by `cost / weight` per tenant, and a free worker always
+    takes the call with the smallest tag. A tenant submitting many expensive
+    calls therefore only delays its own backlog, while a small tenant's call
+    is served within about one call of every other active tenant.
+
+    Args:
+        mode (str): "thread" or "inline".
+        max_workers (int): Size of the thread pool.
+        max_queue (int): Calls allowed to wait for a free worker.
+        timeout_seconds (float): Per-call timeout.
+        weights (dict): Per-tenant config with an optional "weight" share.
+    """
+
+    def __init__(self, mode: str = SEARCH_EXECUTION_MODE, max_workers: int = SEARCH_MAX_WORKERS,
+                 max_queue: int = SEARCH_MAX_QUEUE, timeout_seconds: float = SEARCH_TIMEOUT_SECONDS,
+                 weights=org_search_quota_config):
+        if mode not in ("thread", "inline"):
+            raise ValueError(f"Unsupported search execution mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout_seconds = timeout_seconds
+        self.pending = 0
+        self.shed = 0
+        self.timeouts = 0
+        self.weights = weights
+        self._lock = threading.Lock()
+        self._queue = []
+        self._sequence = itertools.count()
+        self._virtual_time = 0.0
+        self._finish_tags = {}
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="search") if mode == "thread" else None
+
+    def _admit(self) -> bool:
+        with self._lock:
+            if self.pending >= self.max_workers + self.max_queue:
+                self.shed += 1
+                return False
+            self.pending += 1
+            return True
+
+    def _release(self, _future=None):
+        with self._lock:
+            self.pending -= 1
+
+    def _enqueue(self, tenant, cost: float, fn, args) -> Future:
+        weight = self.weights.get(tenant, {}).get("weight", TENANT_WEIGHT)
+        future = Future()
+        with self._lock:
+            start = max(self._virtual_time, self._finish_tags.get(tenant, 0.0))
+            self._finish_tags[tenant] = start + cost / weight
+            heapq.heappush(
+                self._queue,
+                (start, next(self._sequence), fn, args, contextvars.copy_context(), future),
+            )
+        return future
+
+    def _run_next(self):
+        # One of these runs per enqueued call, so every call runs exactly
+        # once; which call a worker picks is decided only when it is free
+        with self._lock:
+            start, _, fn, args, context, future = heapq.heappop(self._queue)
+            self._virtual_time = start
+            if len(self._finish_tags) > 1024:
+                self._finish_tags = {
+                    tenant: finish for tenant, finish in self._finish_tags.items() if finish > start
+                }
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            result = context.run(fn, *args)
+        except BaseException as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+
+    async def run(self, fn, *args, tenant=None, cost: float = 1.0):
+        """
+        Runs `fn(*args)` on the pool on behalf of `tenant`, scheduled by its
+        estimated `cost`, and returns its result.
+        """
+        if self._pool is None:
+            return fn(*args)
+
+        if not self._admit():
+            logger.warning(f"Search shed: {self.pending} calls pending")
+            raise HTTPException(
+                status_code=503, detail="Server busy, retry later", headers={"Retry-After": "1"}
+            )
+
+        # The slot is released when the work really finishes, even after a
+        # timeout, so admission reflects the threads that are still busy.
+        # The work runs in a copy of the caller's context so per-request
+        # state such as stage timings follows it onto the worker thread
+        future = self._enqueue(tenant, cost, fn, args)
+        future.add_done_callback(self._release)
+        self._pool.submit(self._run_next)
+        try:
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self.timeout_seconds)
+        except asyncio.TimeoutError:
+            # Calls still waiting in the queue are dropped; running ones
+            # cannot be interrupted and keep their slot until they finish
+            future.cancel()
+            with self._lock:
+                self.timeouts += 1
+            logger.error(f"Search timed out after {self.timeout_seconds}s")
+            raise HTTPException(status_code=504, detail="Search timed out")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "pending": self.pending,
+                "queued": len(self._queue),
+                "shed": self.shed,
+                "timeouts": self.timeouts,
+            }
+
+
+search_executor = SearchExecutor(os.getenv(SEARCH_EXECUTION_MODE_ENV, SEARCH_EXECUTION_MODE))
@@ -1,15 +1,280 @@
+import os
+import sqlite3
+import threading
 import time
-from collections import defaultdict
-from app.common.constant import MAX_REQUESTS, WINDOW_SECONDS
+from collections import OrderedDict
+from app.common.constant import (
+    MAX_REQUESTS, RATE_LIMIT_BACKEND_ENV, RATE_LIMIT_BUSY_TIMEOUT_SECONDS, RATE_LIMIT_DB_PATH_ENV,
+    RATE_LIMIT_EVICTION_INTERVAL, TENANT_COST_BURST, TENANT_COST_PER_SECOND, WINDOW_SECONDS,
+)
+from app.common.logging_config import get_json_logger
+from app.config.rate_limit_config import org_rate_limit_config
+from app.config.search_quota_config import org_search_quota_config
 
-request_log = defaultdict(list)
+logger = get_json_logger()
+
+
+def _slide(state, now: float, max_requests: int, window_seconds: int):
+    """
+    Applies one request to a sliding-window counter.
+
+    The state is `(window_index, previous_count, current_count)`. The request
+    rate is estimated as the current window's count plus the previous window's
+    count weighted by how much of it still overlaps the sliding window.
+
+    Returns:
+        tuple: (new_state, limited)
+    """
+    window_index = int(now // window_seconds)
+    previous_count = current_count = 0
+    if state is not None:
+        index, previous, current = state
+        if index == window_index:
+            previous_count, current_count = previous, current
+        elif index == window_index - 1:
+            previous_count = current
+
+    overlap = 1 - (now - window_index * window_seconds) / window_seconds
+    if previous_count * overlap + current_count >= max_requests:
+        return (window_index, previous_count, current_count), True
+    return (window_index, previous_count, current_count + 1), False
+
+
+class MemoryBackend:
+    """
+    Per-process counters kept in access order.
+
+    Each key holds a constant-size state. Keys idle for two windows are
+    evicted from the front of the queue on every call, so the cost of
+    eviction is amortized O(1).
+    """
+
+    # Checks never wait on I/O, so callers can run them on the event loop
+    blocking = False
+
+    def __init__(self):
+        self._states = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._states)
+
+    def check(self, key, now: float, max_requests: int, window_seconds: int) -> bool:
+        with self._lock:
+            entry = self._states.pop(key, None)
+            state, limited = _slide(entry and entry[0], now, max_requests, window_seconds)
+            self._states[key] = (state, now + 2 * window_seconds)
+
+            while self._states:
+                oldest_key, (_, expires_at) = next(iter(self._states.items()))
+                if expires_at > now:
+                    break
+                del self._states[oldest_key]
+            return limited
+
+    def reset(self):
+        with self._lock:
+            self._states.clear()
+
+
+class SQLiteBackend:
+    """
+    Counters in a local SQLite file shared by every worker on the host.
+
+    Each check is a single IMMEDIATE transaction, so concurrent workers see
+    each other's counts. Idle keys are deleted every
+    RATE_LIMIT_EVICTION_INTERVAL checks. Commits are not fsynced (WAL with
+    `synchronous=NORMAL`): a power loss may forget the last counts, which
+    only loosens limits briefly.
+
+    A check waits at most RATE_LIMIT_BUSY_TIMEOUT_SECONDS for the database
+    lock and fails open: when the lock or the file is unavailable the
+    request is let through and a warning is logged, so a contended counter
+    never stalls searches. Checks still block on file I/O, so callers on an
+    event loop run them in a thread (see `blocking`).
+
+    Args:
+        path (str): Location of the SQLite database file.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS rate_limits ("
+            "key TEXT PRIMARY KEY, window_index INTEGER, previous_count INTEGER, "
+            "current_count INTEGER, expires_at REAL)"
+        )
+        # Setup may wait for other workers starting up; checks may not
+        self._conn.execute(f"PRAGMA busy_timeout={int(RATE_LIMIT_BUSY_TIMEOUT_SECONDS * 1000)}")
+        self._lock = threading.Lock()
+        self._checks = 0
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+
+    def check(self, key, now: float, max_requests: int, window_seconds: int) -> bool:
+        key = "|".join(map(str, key))
+        with self._lock:
+            try:
+                return self._check(key, now, max_requests, window_seconds)
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Rate limit check skipped for key {key}: {e}")
+                return False
+
+    def _check(self, key: str, now: float, max_requests: int, window_seconds: int) -> bool:
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            state = self._conn.execute(
+                "SELECT window_index, previous_count, current_count FROM rate_limits WHERE key = ?",
+                (key,),
+            ).fetchone()
+            state, limited = _slide(state, now, max_requests, window_seconds)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO rate_limits VALUES (?, ?, ?, ?, ?)",
+                (key, *state, now + 2 * window_seconds),
+            )
+            self._checks += 1
+            if self._checks % RATE_LIMIT_EVICTION_INTERVAL == 0:
+                self._conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+            self._conn.execute("COMMIT")
+        except Exception:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+        return limited
+
+    def reset(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM rate_limits")
+
+
+class RateLimiter:
+    """
+    Sliding-window-counter rate limiter keyed by (organization, IP).
+
+    Limits come from `org_rate_limit_config`, falling back to MAX_REQUESTS
+    per WINDOW_SECONDS for organizations without an entry.
+
+    Args:
+        backend: Storage for the per-key counters (MemoryBackend or SQLiteBackend).
+        limits (dict): Per-organization `max_requests` / `window_seconds`.
+    """
+
+    def __init__(self, backend, limits=org_rate_limit_config):
+        self.backend = backend
+        self.limits = limits
+
+    def limits_for(self, org_id) -> tuple:
+        limits = self.limits.get(org_id, {})
+        return limits.get("max_requests", MAX_REQUESTS), limits.get("window_seconds", WINDOW_SECONDS)
+
+    @property
+    def blocking(self) -> bool:
+        return self.backend.blocking
+
+    def is_rate_limited(self, org_id, ip: str) -> bool:
+        max_requests, window_seconds = self.limits_for(org_id)
+        return self.backend.check((org_id, ip), time.time(), max_requests, window_seconds)
+
+    def reset(self):
+        self.backend.reset()
+
+
+class CostBudget:
+    """
+    Per-organization token buckets of search cost.
+
+    Unlike the request limiter, every request is charged its estimated cost,
+    so one wide query uses up as much budget as many narrow ones. Buckets
+    refill at `cost_per_second` up to `burst`; a request costing more than
+    the burst is charged the burst so it can still run when the bucket is
+    full.
+
+    A full bucket is the same as no bucket, so buckets are kept in access
+    order and dropped from the front once they have refilled, as in
+    MemoryBackend; memory is bounded by the organizations that spent budget
+    recently.
+
+    Args:
+        quotas (dict): Per-organization `cost_per_second` / `burst`.
+    """
+
+    def __init__(self, quotas=org_search_quota_config):
+        self.quotas = quotas
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._buckets)
+
+    def quota_for(self, org_id) -> tuple:
+        quota = self.quotas.get(org_id, {})
+        return quota.get("cost_per_second", TENANT_COST_PER_SECOND), quota.get("burst", TENANT_COST_BURST)
+
+    def charge(self, org_id, cost: float) -> float:
+        """
+        Charges `cost` to the organization's bucket.
+
+        Returns:
+            float: 0 when the cost was admitted, otherwise the seconds until
+            the bucket holds enough budget (nothing is charged then).
+        """
+        return self._apply(org_id, cost, force=False)
+
+    def debit(self, org_id, cost: float):
+        """
+        Charges `cost` unconditionally, for work found to be needed after the
+        request was admitted. The bucket may go negative, which delays the
+        organization's next requests.
+        """
+        self._apply(org_id, cost, force=True)
+
+    def _apply(self, org_id, cost: float, force: bool) -> float:
+        rate, burst = self.quota_for(org_id)
+        cost = min(cost, burst)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._buckets.pop(org_id, None)
+            tokens = burst if entry is None else min(burst, entry[0] + (now - entry[1]) * rate)
+            wait = 0.0
+            if force or tokens >= cost:
+                tokens -= cost
+            else:
+                wait = (cost - tokens) / rate
+            self._buckets[org_id] = (tokens, now, now + (burst - tokens) / rate)
+
+            while self._buckets:
+                oldest_id, (_, _, full_at) = next(iter(self._buckets.items()))
+                if full_at > now:
+                    break
+                del self._buckets[oldest_id]
+            return wait
+
+    def reset(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+def _default_backend():
+    if os.getenv(RATE_LIMIT_BACKEND_ENV, "memory") == "sqlite":
+        return SQLiteBackend(os.getenv(RATE_LIMIT_DB_PATH_ENV, "rate_limits.db"))
+    return MemoryBackend()
+
+
+rate_limiter = RateLimiter(_default_backend())
+cost_budget = CostBudget()
 
 
 def is_rate_limited(org_id: int, ip: str) -> bool:
     """
     Determines whether a request from a given organization and IP should be rate-limited.
 
-    This uses a simple sliding window rate limiter based on timestamps.
+    This uses a sliding window counter with constant state per key.
 
     Args:
         org_id (int): Organization identifier.
@@ -18,13 +283,4 @@ def is_rate_limited(org_id: int, ip: str) -> bool:
     Returns:
         bool: True if the request exceeds the allowed request limit, else False.
     """
-    now = time.time()
-    key = (org_id, ip)
-
-    request_log[key] = [ts for ts in request_log[key] if ts > now - WINDOW_SECONDS]
-
-    if len(request_log[key]) >= MAX_REQUESTS:
-        return True
-
-    request_log[key].append(now)
-    return False
+    return rate_limiter.is_rate_limited(org_id, ip)
@@ -1,11 +1,21 @@
+import atexit
 import logging
+import logging.handlers
 import json
 import os
+import queue
+import random
 import sys
+import threading
+import time
 import traceback
 import inspect
 from functools import wraps
 from typing import Callable, Any
+from app.common.constant import LOG_QUEUE_SIZE, LOG_RATE_LIMITS, LOG_SAMPLE_RATES
+
+# Attributes every LogRecord carries; anything else was passed via `extra`
+RESERVED_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime"}
 
 
 class JsonFormatter(logging.Formatter):
@@ -22,23 +32,114 @@ class JsonFormatter(logging.Formatter):
 
         # Add extra user-defined fields
         for key, value in record.__dict__.items():
-            if key not in logging.LogRecord("", "", "", 0, "", (), None).__dict__:
+            if key not in RESERVED_ATTRS:
                 json_record[key] = value
 
-        return json.dumps(json_record)
+        return json.dumps(json_record, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a configurable fraction of records per level and caps how many
+    records per level pass each second.
+
+    Args:
+        sample_rates (dict): Level name -> fraction of records to keep.
+        rate_limits (dict): Level name -> maximum records per second.
+    """
+
+    def __init__(self, sample_rates=LOG_SAMPLE_RATES, rate_limits=LOG_RATE_LIMITS):
+        super().__init__()
+        self.sample_rates = sample_rates
+        self.rate_limits = rate_limits
+        self._windows = {}
+        self.dropped = 0
+
+    def filter(self, record):
+        rate = self.sample_rates.get(record.levelname, 1.0)
+        if rate < 1.0 and random.random() >= rate:
+            self.dropped += 1
+            return False
+
+        limit = self.rate_limits.get(record.levelname)
+        if limit is not None:
+            second = int(time.monotonic())
+            window, count = self._windows.get(record.levelname, (second, 0))
+            if window != second:
+                window, count = second, 0
+            if count >= limit:
+                self.dropped += 1
+                return False
+            self._windows[record.levelname] = (window, count + 1)
+        return True
+
+
+class NonBlockingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a bounded queue without formatting them.
+
+    Message formatting happens on the listener thread, so `%`-style log
+    arguments are only rendered for records that are actually written.
+    Records are dropped (and counted) instead of blocking when the queue is
+    full.
+    """
+
+    def __init__(self, queue):
+        super().__init__(queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            handler = logging.StreamHandler(sys.stdout)
+            handler.setFormatter(JsonFormatter())
+            _listener = logging.handlers.QueueListener(_log_queue, handler)
+            _listener.start()
+            atexit.register(_listener.stop)
 
 
 def get_json_logger(name="employee_search_json_logger") -> logging.Logger:
     logger = logging.getLogger(name)
     if not logger.handlers:
-        handler = logging.StreamHandler(sys.stdout)
-        handler.setFormatter(JsonFormatter())
+        handler = NonBlockingQueueHandler(_log_queue)
+        handler.addFilter(SamplingFilter())
         logger.setLevel(logging.INFO)
         logger.addHandler(handler)
         logger.propagate = False
+        _start_listener()
     return logger
 
 
+def get_log_stats(name="employee_search_json_logger") -> dict:
+    """
+    Returns queue depth and drop counters of the logger's pipeline.
+    """
+    stats = {"queued": _log_queue.qsize(), "dropped_full_queue": 0, "dropped_sampled": 0}
+    for handler in logging.getLogger(name).handlers:
+        if isinstance(handler, NonBlockingQueueHandler):
+            stats["dropped_full_queue"] += handler.dropped
+            for log_filter in handler.filters:
+                if isinstance(log_filter, SamplingFilter):
+                    stats["dropped_sampled"] += log_filter.dropped
+    return stats
+
+
 def log_json_exceptions(func: Callable) -> Callable:
     logger = get_json_logger()
 
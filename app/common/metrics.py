@@ -0,0 +1,206 @@
+import contextvars
+import threading
+import time
+from bisect import bisect_left
+from app.common.constant import METRICS_LATENCY_BUCKETS, METRICS_MAX_SERIES
+
+# Label values used for series created after a metric reached METRICS_MAX_SERIES
+OVERFLOW_LABEL = "other"
+
+_request_timings = contextvars.ContextVar("request_timings", default=None)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra=()) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """
+    Base class for metrics rendered in the Prometheus text format.
+
+    Series are keyed by their label values. To keep a flood of distinct
+    labels (e.g. random organization ids) from growing memory without bound,
+    series beyond `max_series` are folded into one overflow series.
+    """
+
+    kind = None
+
+    def __init__(self, name: str, documentation: str, labelnames=(), max_series: int = METRICS_MAX_SERIES):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels) -> tuple:
+        # Label values are kept as given and only stringified when rendered
+        if labels not in self._series and len(self._series) >= self.max_series:
+            return (OVERFLOW_LABEL,) * len(self.labelnames)
+        return labels
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            for labels, value in sorted(self._series.items(), key=lambda item: tuple(map(str, item[0]))):
+                lines.extend(self._render_series(labels, value))
+        return lines
+
+    def _render_series(self, labels, value) -> list:
+        return [f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            key = self._key(labels)
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, *labels):
+        return self._series.get(labels, 0)
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels, amount=1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    """
+    Cumulative histogram with fixed upper bounds. Each series keeps one count
+    per bucket plus the running sum and count, so an observation is a bisect
+    and three additions.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=METRICS_LATENCY_BUCKETS,
+                 max_series: int = METRICS_MAX_SERIES):
+        super().__init__(name, documentation, labelnames, max_series)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels):
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                key = self._key(labels)
+                series = self._series.get(key)
+                if series is None:
+                    series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bucket] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, *labels) -> int:
+        series = self._series.get(labels)
+        return series[2] if series else 0
+
+    def _render_series(self, labels, series) -> list:
+        counts, total, count = series
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += bucket_count
+            le = "+Inf" if bound == float("inf") else _format_value(float(bound))
+            lines.append(
+                f"{self.name}_bucket{_format_labels(self.labelnames, labels, [('le', le)])} {cumulative}"
+            )
+        lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(total)}")
+        lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {count}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+stage_seconds = registry.register(Histogram(
+    "employee_search_stage_seconds", "Time spent in each stage of a search request.",
+    ("organization_id", "stage"),
+))
+responses_total = registry.register(Counter(
+    "employee_search_responses_total", "Responses by endpoint and outcome (2xx, 3xx, 4xx, 429, 5xx).",
+    ("endpoint", "outcome"),
+))
+requests_in_flight = registry.register(Gauge(
+    "employee_search_requests_in_flight", "Requests currently being handled by endpoint.",
+    ("endpoint",),
+))
+
+
+def outcome(status_code: int) -> str:
+    # 429 is reported on its own so throttling is not hidden among the 4xx
+    if status_code == 429:
+        return "429"
+    return f"{status_code // 100}xx"
+
+
+def start_request_timings() -> dict:
+    """
+    Starts collecting stage timings for the current request and returns the
+    dict they are recorded into. Threads that run the request's work in a
+    copied context record into the same dict.
+    """
+    timings = {}
+    _request_timings.set(timings)
+    return timings
+
+
+class stage:
+    """
+    Context manager that times the enclosed block as `name` in the stage
+    histogram and in the current request's timings. A plain class rather
+    than a generator-based context manager, since it wraps every stage of
+    every request.
+    """
+
+    __slots__ = ("name", "organization_id", "started")
+
+    def __init__(self, name: str, organization_id):
+        self.name = name
+        self.organization_id = organization_id
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.started
+        stage_seconds.observe(elapsed, self.organization_id, self.name)
+        timings = _request_timings.get()
+        if timings is not None:
+            timings[self.name] = timings.get(self.name, 0.0) + elapsed
+
+
+def format_server_timing(timings: dict) -> str:
+    return ", ".join(f"{name};dur={elapsed * 1000:.3f}" for name, elapsed in timings.items())
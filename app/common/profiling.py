@@ -0,0 +1,209 @@
+import atexit
+import contextvars
+import inspect
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from functools import wraps
+from pathlib import Path
+from typing import Callable
+from app.common.constant import (
+    PROFILING_ENABLED_ENV, PROFILING_HEADER, PROFILING_OUTPUT_DIR, PROFILING_OUTPUT_DIR_ENV,
+    PROFILING_SAMPLE_RATE_ENV, PROFILING_WINDOW_SECONDS,
+)
+from app.common.logging_config import get_json_logger
+
+logger = get_json_logger()
+
+_session = contextvars.ContextVar("profiling_session", default=None)
+
+
+def _frame_name(code) -> str:
+    name = f"{Path(code.co_filename).stem}.{getattr(code, 'co_qualname', code.co_name)}"
+    return name.replace(";", ":")
+
+
+class _Session:
+    """
+    Profile of one sampled request. Shared by every thread that runs part of
+    the request, through the copied context.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.profiled_seconds = 0.0
+        self.samples = Counter()
+        self._lock = threading.Lock()
+
+    def merge(self, samples: Counter, elapsed: float):
+        with self._lock:
+            self.samples.update(samples)
+            self.profiled_seconds += elapsed
+
+
+class _StackTracer:
+    """
+    `sys.setprofile` hook that records the self time of every call stack.
+
+    Each completed call adds its own time, minus the time of its callees, to
+    the `;`-joined stack it ran under; that is exactly the collapsed-stack
+    format flamegraph tools read.
+    """
+
+    def __init__(self, root: str):
+        self.names = [root]
+        self.starts = [time.perf_counter()]
+        self.child_seconds = [0.0]
+        self.samples = Counter()
+
+    def _push(self, name: str):
+        self.names.append(name)
+        self.starts.append(time.perf_counter())
+        self.child_seconds.append(0.0)
+
+    def _pop(self, now: float):
+        elapsed = now - self.starts.pop()
+        self_seconds = elapsed - self.child_seconds.pop()
+        self.samples[";".join(self.names)] += self_seconds
+        self.names.pop()
+        self.child_seconds[-1] += elapsed
+
+    def __call__(self, frame, event, arg):
+        if event == "call":
+            self._push(_frame_name(frame.f_code))
+        elif event == "c_call":
+            self._push(getattr(arg, "__qualname__", repr(arg)).replace(";", ":"))
+        elif len(self.names) > 1:
+            # return, c_return, c_exception; the root is closed by `stop`
+            self._pop(time.perf_counter())
+
+    def stop(self) -> Counter:
+        now = time.perf_counter()
+        while len(self.names) > 1:
+            self._pop(now)
+        return self.samples
+
+
+class Profiler:
+    """
+    Opt-in request profiler writing aggregated collapsed stacks.
+
+    When enabled, a request is profiled if it carries the PROFILING_HEADER
+    header or is picked at `sample_rate`. Stacks of profiled requests are
+    summed (in microseconds of self time) over `window_seconds` and then
+    written to `output_dir` as `profile-<time>-<pid>.collapsed`, ready for
+    flamegraph.pl, speedscope or inferno.
+
+    Args:
+        enabled (bool): Whether profiling is allowed at all. When False,
+            `profile` returns functions unchanged.
+        sample_rate (float): Fraction of requests to profile without the
+            header.
+        output_dir (str): Directory for the collapsed-stack files.
+        window_seconds (float): Aggregation window per file.
+    """
+
+    def __init__(self, enabled: bool = False, sample_rate: float = 0.0, output_dir: str = PROFILING_OUTPUT_DIR,
+                 window_seconds: float = PROFILING_WINDOW_SECONDS):
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.output_dir = output_dir
+        self.window_seconds = window_seconds
+        self.samples = Counter()
+        self.profiled_requests = 0
+        self._window_started = time.monotonic()
+        self._lock = threading.Lock()
+        if enabled:
+            atexit.register(self.flush)
+
+    def should_profile(self, request) -> bool:
+        if request is not None and request.headers.get(PROFILING_HEADER):
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def record(self, session: _Session, total_seconds: float):
+        # Time spent outside any profiled call is charged to the root frame
+        session.samples[session.root] += max(total_seconds - session.profiled_seconds, 0.0)
+        with self._lock:
+            for stack, seconds in session.samples.items():
+                self.samples[stack] += int(seconds * 1_000_000)
+            self.profiled_requests += 1
+            due = time.monotonic() - self._window_started >= self.window_seconds
+        if due:
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the stacks aggregated so far to a new file and starts a new
+        window. Returns the file path, or None when nothing was recorded.
+        """
+        with self._lock:
+            samples, self.samples = self.samples, Counter()
+            requests, self.profiled_requests = self.profiled_requests, 0
+            self._window_started = time.monotonic()
+        samples = {stack: micros for stack, micros in samples.items() if micros > 0}
+        if not samples:
+            return None
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.join(
+            self.output_dir, f"profile-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.collapsed"
+        )
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, micros in sorted(samples.items()):
+                f.write(f"{stack} {micros}\n")
+        logger.info(f"Wrote profile of {requests} requests to {path}")
+        return path
+
+    def profile(self, func: Callable) -> Callable:
+        """
+        Decorator in the style of `log_json_exceptions`. On a coroutine
+        (an endpoint taking `request`) it decides whether the request is
+        profiled and charges the request's wall time to a root frame named
+        after the endpoint. On a plain function it traces the call stacks
+        when, and only when, it runs inside a profiled request, including on
+        worker threads that received the request's context.
+        """
+        if not self.enabled:
+            return func
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if not self.should_profile(kwargs.get("request")):
+                return await func(*args, **kwargs)
+            session = _Session(func.__name__)
+            token = _session.set(session)
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                _session.reset(token)
+                self.record(session, time.perf_counter() - started)
+
+        @wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            session = _session.get()
+            if session is None or isinstance(sys.getprofile(), _StackTracer):
+                return func(*args, **kwargs)
+            tracer = _StackTracer(session.root)
+            previous = sys.getprofile()
+            started = time.perf_counter()
+            sys.setprofile(tracer)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                sys.setprofile(previous)
+                session.merge(tracer.stop(), time.perf_counter() - started)
+
+        return async_wrapper if inspect.iscoroutinefunction(func) else sync_wrapper
+
+
+profiler = Profiler(
+    enabled=os.getenv(PROFILING_ENABLED_ENV, "").lower() in ("1", "true", "yes"),
+    sample_rate=float(os.getenv(PROFILING_SAMPLE_RATE_ENV, "0")),
+    output_dir=os.getenv(PROFILING_OUTPUT_DIR_ENV, PROFILING_OUTPUT_DIR),
+)
+profile_requests = profiler.profile
@@ -0,0 +1,110 @@
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from app.common.constant import QUERY_CACHE_MAX_ENTRIES, QUERY_CACHE_TTL_SECONDS
+
+
+class QueryCache:
+    """
+    Bounded in-process cache for search results with LRU and TTL eviction.
+
+    Entries are grouped by scope (the organization) and stored under the
+    scope's data version; keys are expected to include the org's column
+    config, so a data or config change never serves stale results. When a
+    newer version of a scope is seen, only that scope's older entries are
+    dropped, so a write to one organization leaves every other one cached.
+
+    Args:
+        max_entries (int): Maximum number of cached results.
+        ttl_seconds (float): Lifetime of a cached result.
+    """
+
+    def __init__(self, max_entries: int = QUERY_CACHE_MAX_ENTRIES, ttl_seconds: float = QUERY_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._versions = {}
+        self._scope_keys = defaultdict(set)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def _sync_version(self, scope, version: int):
+        current = self._versions.get(scope)
+        if current is None or version > current:
+            stale = self._scope_keys.pop(scope, ())
+            for entry_key in stale:
+                del self._entries[entry_key]
+            self.invalidations += len(stale)
+            self._versions[scope] = version
+
+    def _remove(self, entry_key):
+        del self._entries[entry_key]
+        self._discard_scope_key(entry_key)
+
+    def _discard_scope_key(self, entry_key):
+        keys = self._scope_keys.get(entry_key[0])
+        if keys is not None:
+            keys.discard(entry_key)
+            if not keys:
+                del self._scope_keys[entry_key[0]]
+
+    def get(self, scope, version: int, key):
+        """
+        Returns the cached value for `key` under `scope`'s data `version`, or
+        None.
+        """
+        entry_key = (scope, version, key)
+        with self._lock:
+            self._sync_version(scope, version)
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(entry_key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(entry_key)
+            self.hits += 1
+            return value
+
+    def put(self, scope, version: int, key, value):
+        entry_key = (scope, version, key)
+        with self._lock:
+            self._sync_version(scope, version)
+            if version != self._versions[scope]:
+                return
+            self._entries[entry_key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(entry_key)
+            self._scope_keys[scope].add(entry_key)
+            while len(self._entries) > self.max_entries:
+                evicted, _ = self._entries.popitem(last=False)
+                self._discard_scope_key(evicted)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._scope_keys.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+query_cache = QueryCache()
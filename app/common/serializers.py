@@ -0,0 +1,99 @@
+import json
+import weakref
+from dataclasses import fields
+from json.encoder import encode_basestring
+from app.common.constant import EXPORT_CHUNK_ROWS, SERIALIZER_FRAGMENT_CACHE_SIZE
+from app.config.organization_fields_config import org_column_config
+from app.models.employee import Employee
+
+_ENCODERS = {int: str, str: encode_basestring}
+_FIELD_ENCODERS = {f.name: _ENCODERS.get(f.type, json.dumps) for f in fields(Employee)}
+
+
+class ProjectionSerializer:
+    """
+    JSON encoder for one organization's `org_column_config` projection.
+
+    The projection is compiled once into a %-format template with one
+    type-specific encoder per column, and rows are read straight from the
+    partition's columnar table without materializing Employee objects.
+    Encoded row fragments are cached per partition; published partitions
+    never change, so a fragment stays valid for the partition's lifetime.
+
+    Args:
+        columns (tuple): Projected columns, or None for every Employee field.
+    """
+
+    def __init__(self, columns):
+        self.columns_key = columns
+        projected = [col for col in (columns or _FIELD_ENCODERS) if col in _FIELD_ENCODERS]
+        self.columns = tuple(projected)
+        self.encoders = tuple(_FIELD_ENCODERS[col] for col in projected)
+        self.template = "{" + ",".join(
+            encode_basestring(col).replace("%", "%%") + ":%s" for col in projected
+        ) + "}"
+        self._fragments = weakref.WeakKeyDictionary()
+
+    def encode_row(self, table, row_id: int) -> str:
+        return self.template % tuple(
+            encode(table.value(col, row_id)) for col, encode in zip(self.columns, self.encoders)
+        )
+
+    def encode_rows(self, partition, row_ids) -> str:
+        fragments = self._fragments.get(partition)
+        if fragments is None:
+            fragments = self._fragments[partition] = {}
+        encoded = []
+        for row_id in row_ids:
+            fragment = fragments.get(row_id)
+            if fragment is None:
+                fragment = self.encode_row(partition.table, row_id)
+                if len(fragments) < SERIALIZER_FRAGMENT_CACHE_SIZE:
+                    fragments[row_id] = fragment
+            encoded.append(fragment)
+        return "[" + ",".join(encoded) + "]"
+
+
+_serializers = {}
+
+
+def get_serializer(organization_id: int) -> ProjectionSerializer:
+    """
+    Returns the compiled serializer for the organization, recompiling it when
+    its `org_column_config` entry has changed.
+    """
+    columns = org_column_config.get(organization_id)
+    columns = tuple(columns) if columns else None
+    serializer = _serializers.get(organization_id)
+    if serializer is None or serializer.columns_key != columns:
+        serializer = _serializers[organization_id] = ProjectionSerializer(columns)
+    return serializer
+
+
+def encode_results(organization_id: int, partition, row_ids, **envelope) -> bytes:
+    """
+    Encodes `{"results": [...], **envelope}` for the given rows directly to
+    JSON bytes.
+    """
+    body = '{"results":' + get_serializer(organization_id).encode_rows(partition, row_ids)
+    for key, value in envelope.items():
+        body += f",{encode_basestring(key)}:{json.dumps(value)}"
+    return (body + "}").encode("utf-8")
+
+
+def iter_ndjson(organization_id: int, partition, row_ids, chunk_rows: int = EXPORT_CHUNK_ROWS):
+    """
+    Yields the given rows as NDJSON, one projected object per line, in
+    chunks of `chunk_rows` lines. Rows are encoded as the chunk is produced
+    and bypass the fragment cache, so memory stays bounded by one chunk.
+    """
+    serializer = get_serializer(organization_id)
+    table = partition.table
+    lines = []
+    for row_id in row_ids:
+        lines.append(serializer.encode_row(table, row_id))
+        if len(lines) >= chunk_rows:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
@@ -0,0 +1,285 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from app.common.constant import CATEGORICAL_FIELDS, INDEXED_FIELDS, SNAPSHOT_VERSION
+from app.common.employee_table import EMPLOYEE_FIELDS, EmployeeTable
+from app.common.logging_config import get_json_logger
+from app.models.organization import Organization
+
+logger = get_json_logger()
+
+MAGIC = b"EMPSNAP\0"
+# magic, format version, header offset, header length
+PREFIX = struct.Struct("<8sIQQ")
+STRING_COLUMNS = ("first_name", "last_name", "contact_info")
+
+
+class StringColumn:
+    """
+    Read-only sequence of strings stored as a UTF-8 blob plus an offsets array.
+    """
+
+    def __init__(self, offsets, blob):
+        self.offsets = offsets
+        self.blob = blob
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return str(self.blob[self.offsets[i]:self.offsets[i + 1]], "utf-8")
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+
+class PostingTable:
+    """
+    Read-only mapping from a string key to a sorted array of row ids.
+
+    Keys are kept sorted so `get` is a bisect over the mapped file rather than
+    a dict built at startup.
+    """
+
+    def __init__(self, keys, bounds, rows):
+        self.keys = keys
+        self.bounds = bounds
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def items(self):
+        for i in range(len(self.keys)):
+            yield self.keys[i], self.rows[self.bounds[i]:self.bounds[i + 1]]
+
+    def get(self, key, default=None):
+        i = bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self.rows[self.bounds[i]:self.bounds[i + 1]]
+        return default
+
+
+class _SnapshotWriter:
+    def __init__(self, f):
+        self.f = f
+
+    def _align(self):
+        padding = -self.f.tell() % 8
+        if padding:
+            self.f.write(b"\0" * padding)
+
+    def write_array(self, typecode: str, values) -> dict:
+        values = values if isinstance(values, array) and values.typecode == typecode else array(typecode, values)
+        self._align()
+        offset = self.f.tell()
+        values.tofile(self.f)
+        return {"type": typecode, "offset": offset, "count": len(values)}
+
+    def write_strings(self, strings) -> dict:
+        offsets = array("Q", [0])
+        self._align()
+        blob_offset = self.f.tell()
+        for value in strings:
+            encoded = value.encode("utf-8")
+            self.f.write(encoded)
+            offsets.append(offsets[-1] + len(encoded))
+        return {
+            "blob": {"offset": blob_offset, "size": offsets[-1]},
+            "offsets": self.write_array("Q", offsets),
+        }
+
+    def write_postings(self, mapping) -> dict:
+        keys = sorted(key for key, row_ids in mapping.items() if row_ids)
+        bounds = array("Q", [0])
+        rows = array("I")
+        for key in keys:
+            rows.extend(sorted(mapping[key]))
+            bounds.append(len(rows))
+        return {
+            "keys": self.write_strings(keys),
+            "bounds": self.write_array("Q", bounds),
+            "rows": self.write_array("I", rows),
+        }
+
+    def write_partition(self, partition) -> dict:
+        partition = partition.compacted()
+        table = partition.table
+        return {
+            "ids": self.write_array("q", table.ids),
+            "columns": {name: self.write_strings(table.columns[name]) for name in STRING_COLUMNS},
+            "folded_first_names": self.write_strings(table.folded_first_names),
+            "folded_last_names": self.write_strings(table.folded_last_names),
+            "codes": {field: self.write_array("I", table.codes[field]) for field in CATEGORICAL_FIELDS},
+            "dictionaries": {field: list(table.dictionaries[field]) for field in CATEGORICAL_FIELDS},
+            "folded": {field: list(table.folded[field]) for field in CATEGORICAL_FIELDS},
+            "indexes": {field: self.write_postings(partition.indexes[field]) for field in INDEXED_FIELDS},
+            "name_grams": self.write_postings(partition.name_grams),
+            "sorted_names": self.write_strings(partition.sorted_names),
+            "sorted_name_rows": self.write_array("I", partition.sorted_name_rows),
+        }
+
+
+def write_snapshot(store, path: str):
+    """
+    Writes the store's tables and indexes to `path` in the binary snapshot
+    format. The file is written next to `path` and atomically renamed, so
+    readers never observe a partial snapshot.
+
+    The header records a digest of the data section and the header itself,
+    which identifies the dataset independently of the process serving it.
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w+b") as f:
+        f.write(PREFIX.pack(MAGIC, SNAPSHOT_VERSION, 0, 0))
+        writer = _SnapshotWriter(f)
+        partitions = {
+            str(org_id): writer.write_partition(partition)
+            for org_id, partition in store.partitions.items()
+        }
+        header = {
+            "byteorder": sys.byteorder,
+            "fields": list(EMPLOYEE_FIELDS),
+            "organizations": [[org.id, org.name] for org in store.organizations.values()],
+            "partitions": partitions,
+        }
+        header_offset = f.tell()
+
+        digest = hashlib.blake2b(json.dumps(header).encode("utf-8"), digest_size=16)
+        f.seek(PREFIX.size)
+        remaining = header_offset - PREFIX.size
+        while remaining:
+            chunk = f.read(min(remaining, 1 << 20))
+            digest.update(chunk)
+            remaining -= len(chunk)
+        header["digest"] = digest.hexdigest()
+
+        header = json.dumps(header).encode("utf-8")
+        f.seek(header_offset)
+        f.write(header)
+        f.seek(0)
+        f.write(PREFIX.pack(MAGIC, SNAPSHOT_VERSION, header_offset, len(header)))
+    os.replace(tmp_path, path)
+
+
+class _SnapshotReader:
+    def __init__(self, buffer):
+        self.buffer = buffer
+
+    def read_array(self, ref: dict):
+        itemsize = array(ref["type"]).itemsize
+        start = ref["offset"]
+        return self.buffer[start:start + ref["count"] * itemsize].cast(ref["type"])
+
+    def read_strings(self, ref: dict) -> StringColumn:
+        blob = ref["blob"]
+        return StringColumn(
+            self.read_array(ref["offsets"]),
+            self.buffer[blob["offset"]:blob["offset"] + blob["size"]],
+        )
+
+    def read_postings(self, ref: dict) -> PostingTable:
+        return PostingTable(
+            self.read_strings(ref["keys"]),
+            self.read_array(ref["bounds"]),
+            self.read_array(ref["rows"]),
+        )
+
+    def read_partition(self, ref: dict) -> dict:
+        ids = self.read_array(ref["ids"])
+        table = EmployeeTable.from_columns(
+            ids=ids,
+            columns={name: self.read_strings(column) for name, column in ref["columns"].items()},
+            folded_first_names=self.read_strings(ref["folded_first_names"]),
+            folded_last_names=self.read_strings(ref["folded_last_names"]),
+            codes={field: self.read_array(codes) for field, codes in ref["codes"].items()},
+            dictionaries=ref["dictionaries"],
+            folded=ref["folded"],
+        )
+        return {
+            "table": table,
+            "indexes": {field: self.read_postings(index) for field, index in ref["indexes"].items()},
+            "name_grams": self.read_postings(ref["name_grams"]),
+            "sorted_names": self.read_strings(ref["sorted_names"]),
+            "sorted_name_rows": self.read_array(ref["sorted_name_rows"]),
+        }
+
+
+def read_snapshot(path: str):
+    """
+    Memory-maps the snapshot at `path` read-only.
+
+    Columns and postings are zero-copy views over the mapping, so every
+    worker that opens the same file shares one physical copy through the page
+    cache. Only the small JSON header is parsed.
+
+    Returns:
+        tuple: (organizations, {organization_id: partition parts}, digest)
+        where the parts are the keyword arguments of OrgPartition.from_parts
+        and digest identifies the snapshot's content.
+
+    Raises:
+        ValueError: If the file is not a snapshot or was written by an
+        incompatible format version, byte order or Employee schema.
+    """
+    with open(path, "rb") as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    buffer = memoryview(mapped)
+
+    if len(buffer) < PREFIX.size:
+        raise ValueError(f"Not an employee snapshot: {path}")
+    magic, version, header_offset, header_len = PREFIX.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"Not an employee snapshot: {path}")
+    if version != SNAPSHOT_VERSION:
+        raise ValueError(
+            f"Stale snapshot {path}: format version {version}, expected {SNAPSHOT_VERSION}"
+        )
+
+    header_bytes = bytes(buffer[header_offset:header_offset + header_len])
+    header = json.loads(header_bytes)
+    if header["byteorder"] != sys.byteorder or header["fields"] != list(EMPLOYEE_FIELDS):
+        raise ValueError(f"Stale snapshot {path}: byte order or employee schema mismatch")
+
+    reader = _SnapshotReader(buffer)
+    organizations = [Organization(org_id, name) for org_id, name in header["organizations"]]
+    partitions = {
+        int(org_id): reader.read_partition(ref) for org_id, ref in header["partitions"].items()
+    }
+    # Snapshots written before digests were recorded fall back to the header
+    digest = header.get("digest") or hashlib.blake2b(header_bytes, digest_size=16).hexdigest()
+    return organizations, partitions, digest
+
+
+def main(argv=None):
+    from app.common.employee_store import EmployeeStore, load_store
+    from app.employee_data.employee_data import employees, organizations
+
+    parser = argparse.ArgumentParser(description="Build a memory-mappable employee snapshot.")
+    parser.add_argument("output", help="Path of the snapshot file to write")
+    parser.add_argument("--employees", help="Employees CSV/JSONL file (defaults to the bundled sample data)")
+    parser.add_argument("--organizations", help="Organizations CSV/JSONL file")
+    args = parser.parse_args(argv)
+
+    if bool(args.employees) != bool(args.organizations):
+        parser.error("--employees and --organizations must be given together")
+    if args.employees:
+        store = load_store(args.employees, args.organizations)
+    else:
+        store = EmployeeStore(employees, organizations)
+
+    write_snapshot(store, args.output)
+    logger.info(f"Wrote snapshot of {len(store)} employees to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
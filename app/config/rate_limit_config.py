@@ -0,0 +1,5 @@
+# Per-organization overrides of MAX_REQUESTS / WINDOW_SECONDS from app/common/constant.py
+org_rate_limit_config = {
+    1: {"max_requests": 5, "window_seconds": 60},
+    2: {"max_requests": 5, "window_seconds": 60},
+}
\ No newline at end of file
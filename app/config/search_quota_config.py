@@ -0,0 +1,7 @@
+# Per-organization search cost budgets and scheduling weights. Overrides
+# TENANT_COST_PER_SECOND / TENANT_COST_BURST / TENANT_WEIGHT from
+# app/common/constant.py; one cost unit is SEARCH_COST_ROWS_PER_UNIT rows.
+org_search_quota_config = {
+    1: {"cost_per_second": 1000, "burst": 5000, "weight": 1},
+    2: {"cost_per_second": 1000, "burst": 5000, "weight": 1},
+}
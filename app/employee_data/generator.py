@@ -0,0 +1,129 @@
+import argparse
+import json
+import random
+from dataclasses import asdict
+from itertools import accumulate
+from pathlib import Path
+from app.common.logging_config import get_json_logger
+from app.models.employee import Employee
+from app.models.organization import Organization
+
+logger = get_json_logger()
+
+FIRST_NAMES = (
+    "Aarav", "Bhavin", "Charvi", "Dinesh", "Esha", "Farhan", "Gauri", "Harsh", "Ishita", "Jay",
+    "Kavya", "Laksh", "Meera", "Nikhil", "Ojasvi", "Pranav", "Riya", "Sahil", "Tara", "Uday",
+    "Alice", "Bob", "Carol", "David", "Emma", "Frank", "Grace", "Henry", "Irene", "Jack",
+    "Liam", "Maria", "Noah", "Olivia", "Peter", "Quinn", "Rosa", "Sam", "Tom", "Zoe",
+)
+LAST_NAMES = (
+    "Sharma", "Joshi", "Mehta", "Rao", "Desai", "Ali", "Kapoor", "Patel", "Verma", "Kumar",
+    "Singh", "Reddy", "Yadav", "Bansal", "Pandey", "Ghosh", "Chauhan", "Agarwal", "Iyer", "Nair",
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Wilson", "Moore",
+)
+DEPARTMENTS = (
+    "Engineering", "Sales", "Operations", "Support", "Marketing", "Finance", "HR", "QA",
+    "Security", "Legal", "Admin", "AI Research",
+)
+POSITIONS = (
+    "Engineer", "Developer", "Analyst", "Executive", "Manager", "Lead", "Tester", "Coordinator",
+    "Intern", "Architect", "Scientist", "Director",
+)
+LOCATIONS = (
+    "Bangalore", "NY", "London", "Pune", "SF", "Mumbai", "Chicago", "Austin", "Delhi", "Hyderabad",
+    "Chennai", "Boston", "Dallas", "LA", "Seattle", "Berlin", "Toronto", "Singapore", "Sydney",
+    "Mountain View", "Paris", "Dublin", "Tokyo", "Amsterdam",
+)
+STATUSES = ("Active", "Terminated", "Not started")
+STATUS_WEIGHTS = (70, 20, 10)
+
+
+def zipf_weights(count: int, skew: float = 1.1) -> list:
+    """
+    Returns cumulative Zipf weights for `count` ranked values: the value at
+    rank r is drawn proportionally to 1 / r**skew.
+    """
+    return list(accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+def generate_organizations(count: int) -> list:
+    return [Organization(org_id, f"Org{org_id}") for org_id in range(1, count + 1)]
+
+
+def iter_generated_employees(count: int, organizations, seed: int = 0, skew: float = 1.1):
+    """
+    Lazily yields `count` reproducible Employee records.
+
+    Organization sizes and department, position and location values follow
+    Zipf distributions, so a few large orgs and common values dominate as in
+    real tenants. The same `seed` always yields the same records.
+
+    Args:
+        count (int): Number of employees to generate.
+        organizations (list): Organizations to distribute employees over,
+            largest first.
+        seed (int): Random seed.
+        skew (float): Zipf exponent; higher values concentrate more rows in
+            the first organizations and values.
+    """
+    rng = random.Random(seed)
+    org_weights = zipf_weights(len(organizations), skew)
+    department_weights = zipf_weights(len(DEPARTMENTS), skew)
+    position_weights = zipf_weights(len(POSITIONS), skew)
+    location_weights = zipf_weights(len(LOCATIONS), skew)
+    status_weights = list(accumulate(STATUS_WEIGHTS))
+
+    for employee_id in range(1, count + 1):
+        org = rng.choices(organizations, cum_weights=org_weights)[0]
+        first_name = rng.choice(FIRST_NAMES)
+        last_name = rng.choice(LAST_NAMES)
+        yield Employee(
+            employee_id,
+            first_name,
+            last_name,
+            f"{first_name.lower()}.{last_name.lower()}{employee_id}@{org.name.lower()}.com",
+            rng.choices(DEPARTMENTS, cum_weights=department_weights)[0],
+            rng.choices(POSITIONS, cum_weights=position_weights)[0],
+            rng.choices(LOCATIONS, cum_weights=location_weights)[0],
+            rng.choices(STATUSES, cum_weights=status_weights)[0],
+            org.id,
+        )
+
+
+def write_dataset(directory: str, employee_count: int, organization_count: int, seed: int = 0):
+    """
+    Writes a generated dataset as `employees.jsonl` and `organizations.jsonl`
+    in `directory`, in the format read by `load_store`.
+
+    Returns:
+        tuple: (employees_path, organizations_path)
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    organizations = generate_organizations(organization_count)
+    employees_path = directory / "employees.jsonl"
+    organizations_path = directory / "organizations.jsonl"
+
+    with open(organizations_path, "w", encoding="utf-8") as f:
+        for org in organizations:
+            f.write(json.dumps(asdict(org)) + "\n")
+    with open(employees_path, "w", encoding="utf-8") as f:
+        for employee in iter_generated_employees(employee_count, organizations, seed):
+            f.write(json.dumps(asdict(employee)) + "\n")
+    return str(employees_path), str(organizations_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a reproducible synthetic employee dataset.")
+    parser.add_argument("output", help="Directory to write employees.jsonl and organizations.jsonl to")
+    parser.add_argument("--employees", type=int, default=1_000_000, help="Number of employees")
+    parser.add_argument("--organizations", type=int, default=100, help="Number of organizations")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args(argv)
+
+    paths = write_dataset(args.output, args.employees, args.organizations, args.seed)
+    logger.info(f"Wrote {args.employees} employees and {args.organizations} organizations to {paths}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import csv
+import hashlib
+import json
+from dataclasses import fields
+from functools import lru_cache, partial
+from pathlib import Path
+from app.common.logging_config import get_json_logger
+from app.models.employee import Employee
+from app.models.organization import Organization
+
+logger = get_json_logger()
+
+
+def iter_records(path: str):
+    """
+    Lazily yields `(line_number, record)` pairs from a CSV or JSONL file.
+
+    The format is chosen from the file suffix (`.csv`, `.jsonl`/`.ndjson`).
+    CSV records are dicts; JSONL records are the raw lines, decoded by
+    `parse_record` so a malformed line is skipped like any invalid row.
+    Blank JSONL lines are skipped.
+    """
+    suffix = Path(path).suffix.lower()
+    if suffix not in (".csv", ".jsonl", ".ndjson"):
+        raise ValueError(f"Unsupported data file format: {path}")
+
+    with open(path, newline="", encoding="utf-8") as f:
+        if suffix == ".csv":
+            for line_number, record in enumerate(csv.DictReader(f), start=2):
+                yield line_number, record
+        else:
+            for line_number, line in enumerate(f, start=1):
+                if line.strip():
+                    yield line_number, line
+
+
+@lru_cache(maxsize=None)
+def _field_types(model) -> tuple:
+    return tuple((field.name, field.type) for field in fields(model))
+
+
+def parse_record(model, record: dict):
+    """
+    Validates `record` (a dict or a JSON object string) against the dataclass
+    `model`, coercing each field to its annotated type. Raises ValueError on
+    malformed JSON, non-object records and missing or malformed fields.
+    """
+    if isinstance(record, str):
+        try:
+            record = json.loads(record)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {e}")
+    if not isinstance(record, dict):
+        raise ValueError(f"Expected an object, got {type(record).__name__}")
+    values = []
+    for name, field_type in _field_types(model):
+        value = record.get(name)
+        if value is None or value == "":
+            raise ValueError(f"Missing field: {name}")
+        try:
+            values.append(field_type(value))
+        except (TypeError, ValueError):
+            raise ValueError(f"Invalid value for {name}: {value!r}")
+    return model(*values)
+
+
+def iter_models(model, path: str):
+    """
+    Yields validated `model` instances from `path`, skipping invalid rows.
+    """
+    skipped = 0
+    for line_number, record in iter_records(path):
+        try:
+            yield parse_record(model, record)
+        except ValueError as e:
+            skipped += 1
+            logger.warning(f"Skipping invalid {model.__name__} row at {path}:{line_number}: {e}")
+    if skipped:
+        logger.warning(f"Skipped {skipped} invalid {model.__name__} rows in {path}")
+
+
+def file_digest(*paths) -> str:
+    """
+    Returns a digest of the content of `paths`, identifying a dataset
+    independently of when or by which process it was loaded.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        with open(path, "rb") as f:
+            for chunk in iter(partial(f.read, 1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+
+def iter_employees(path: str):
+    return iter_models(Employee, path)
+
+
+def iter_organizations(path: str):
+    return iter_models(Organization, path)
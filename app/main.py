@@ -1,71 +1,449 @@
-from fastapi import FastAPI, Request, HTTPException, Query
-from app.common.limit_utils import is_rate_limited
-from app.common.employee_utils import EmployeeSearchService
-from app.common.logging_config import get_json_logger, log_json_exceptions
+import json
+import math
+import os
+import time
+from contextlib import contextmanager
+from dataclasses import fields
+from typing import List
+from fastapi import Depends, FastAPI, Request, HTTPException, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.routing import Match
+from app.common.limit_utils import cost_budget, is_rate_limited, rate_limiter
+from app.common.constant import BATCH_MAX_QUERIES, SEARCH_COST_BASE, SERVER_TIMING_ENV
+from app.common.employee_store import employee_store
+from app.common.employee_utils import EmployeeSearchService, estimate_cost
+from app.common.executor_utils import search_executor
+from app.common.logging_config import get_json_logger, get_log_stats, log_json_exceptions
+from app.common.metrics import (
+    format_server_timing, outcome, registry, requests_in_flight, responses_total, stage,
+    start_request_timings,
+)
+from app.common.profiling import profile_requests
+from app.common.query_cache import query_cache
+from app.models.employee import Employee
+from app.models.organization import Organization
+from app.models.search import SearchFilters, SearchSpec
 
 app = FastAPI(title="Employee Search API")
 ALLOWED_STATUSES = {"active", "not started", "terminated"}
 logger = get_json_logger()
+SERVER_TIMING_ENABLED = os.getenv(SERVER_TIMING_ENV, "").lower() in ("1", "true", "yes")
+
+def _endpoint(scope) -> str:
+    # Route templates, not raw paths, so ids in the URL don't create series
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+    return "unmatched"
+
+@app.middleware("http")
+async def record_metrics(request: Request, call_next):
+    endpoint = _endpoint(request.scope)
+    timings = start_request_timings()
+    requests_in_flight.inc(endpoint)
+    started = time.perf_counter()
+    try:
+        response = await call_next(request)
+    except Exception:
+        responses_total.inc(endpoint, "5xx")
+        raise
+    finally:
+        requests_in_flight.dec(endpoint)
+
+    responses_total.inc(endpoint, outcome(response.status_code))
+    if SERVER_TIMING_ENABLED:
+        timings["total"] = time.perf_counter() - started
+        response.headers["Server-Timing"] = format_server_timing(timings)
+    return response
+
+def validate_statuses(status: str):
+    statuses = [s.strip().lower() for s in status.split(",")]
+    invalid = [s for s in statuses if s not in ALLOWED_STATUSES]
+    if invalid:
+        logger.error(f"Invalid status values: {invalid}")
+        raise HTTPException(
+            status_code=400,
+            detail=(f"Invalid status value(s): {', '.join(invalid)}. "
+                    f"Allowed: {', '.join(ALLOWED_STATUSES)}"),
+        )
+
+def build_filters(filters: SearchFilters) -> dict:
+    """
+    Returns the filters of a request that were given, by name. Every
+    categorical value may be a comma-separated IN-list; `not_<field>` values
+    are excluded.
+    """
+    given = {field.name: getattr(filters, field.name) for field in fields(SearchFilters)}
+    for key in ("status", "not_status"):
+        if given[key]:
+            validate_statuses(given[key])
+    return {key: value for key, value in given.items() if value}
+
+async def rate_limited(organization_id: int, ip: str) -> bool:
+    # The SQLite backend waits on file locks and I/O, which must not stall
+    # the event loop; in-memory counters are cheaper than a thread hop
+    with stage("rate_limit", organization_id):
+        if rate_limiter.blocking:
+            return await run_in_threadpool(is_rate_limited, organization_id, ip)
+        return is_rate_limited(organization_id, ip)
+
+async def enforce_rate_limit(organization_id: int, ip: str):
+    if await rate_limited(organization_id, ip):
+        logger.warning(f"Rate limit exceeded for IP: {ip}, org_id: {organization_id}")
+        raise HTTPException(status_code=429, detail="Rate limit exceeded")
+
+@contextmanager
+def handle_errors(action: str):
+    """
+    Logs errors raised while serving `action` and turns unexpected ones into
+    a 500; HTTP errors are re-raised unchanged.
+    """
+    try:
+        yield
+    except HTTPException as http_err:
+        logger.error(f"HTTP error during employee {action}. Reason: {http_err.detail}")
+        raise http_err
+    except Exception as e:
+        logger.error(f"Unexpected error during employee {action}: {str(e)}")
+        raise HTTPException(
+            status_code=500, detail=f"Internal server error: {str(e)}"
+        )
+
+def search_cost(organization_id: int, filters: dict) -> float:
+    return estimate_cost(employee_store.view().get_partition(organization_id), filters)
+
+def charge_search_cost(organization_id: int, filters: dict, conditional: bool = False) -> float:
+    """
+    Charges the estimated cost of a search to the organization's budget and
+    returns it, or raises 429 with a Retry-After when the budget is spent.
+
+    A conditional request (with If-None-Match) may be answered with a cheap
+    304, so only SEARCH_COST_BASE is charged up front; `charge_full_cost`
+    charges the rest once a full response is built. Unknown organizations
+    are not charged: the search rejects them with 404, and charging would
+    keep a bucket for every made-up id.
+    """
+    if employee_store.get_organization(organization_id) is None:
+        return SEARCH_COST_BASE
+    with stage("cost_budget", organization_id):
+        cost = search_cost(organization_id, filters)
+        wait = cost_budget.charge(organization_id, SEARCH_COST_BASE if conditional else cost)
+    if wait:
+        logger.warning(f"Search cost budget exceeded for org_id: {organization_id} (cost {cost:.1f})")
+        raise HTTPException(
+            status_code=429, detail="Search cost budget exceeded",
+            headers={"Retry-After": str(math.ceil(wait))},
+        )
+    return cost
+
+def charge_full_cost(organization_id: int, cost: float, conditional: bool):
+    if conditional:
+        cost_budget.debit(organization_id, cost - SEARCH_COST_BASE)
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against `etag`, as RFC 9110
+    requires for GET requests.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+@profile_requests
+def run_search(organization_id: int, filters: dict, cursor, page: int, page_size: int,
+               view=None, lookups=None, if_none_match: str = None):
+    """
+    Returns `(etag, body)`. The body is None when `if_none_match` already
+    names the current ETag; nothing is filtered or serialized then.
+    """
+    service = EmployeeSearchService(organization_id, filters, view, lookups)
+    if cursor is not None:
+        etag = service.etag("cursor", cursor, page_size)
+        if etag_matches(if_none_match, etag):
+            return etag, None
+        return etag, service.run_cursor_json(cursor, page_size)
+    etag = service.etag("page", page, page_size)
+    if etag_matches(if_none_match, etag):
+        return etag, None
+    return etag, service.run_json(page, page_size)
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag})
+
+def run_explain(organization_id: int, filters: dict) -> dict:
+    return EmployeeSearchService(organization_id, filters).explain()
 
 @log_json_exceptions
 @app.get("/resource/employees/search")
+@profile_requests
 async def search(
     request: Request,
     organization_id: int = Query(..., description="Organization ID"),
-    search: str = Query(None, description="Search term for first or last name"),
-    status: str = Query(None, description="Employee status (active,not started,terminated)"),
-    department: str = Query(None, description="Department name(ex:-AcmeCorp)"),
-    position: str = Query(None, description="Job position"),
-    location: str = Query(None, description="Employee location"),
+    filter_params: SearchFilters = Depends(),
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(10, ge=1, le=100, description="Number of results per page"),
+    cursor: str = Query(None, description="Opaque cursor for keyset pagination (empty for the first page)"),
+    explain: bool = Query(False, description="Return the query plan and per-step row counts instead of results"),
 ):
     ip = request.client.host
-    logger.info(f"Search requested from IP: {ip}, org_id: {organization_id}")
+    logger.info("Search requested from IP: %s, org_id: %s", ip, organization_id)
 
-    if is_rate_limited(organization_id, ip):
-        logger.warning(f"Rate limit exceeded for IP: {ip}, org_id: {organization_id}")
-        raise HTTPException(status_code=429, detail="Rate limit exceeded")
+    await enforce_rate_limit(organization_id, ip)
 
-    filters = {}
-    if status:
-        statuses = [s.strip().lower() for s in status.split(",")]
-        invalid = [s for s in statuses if s not in ALLOWED_STATUSES]
-        if invalid:
-            logger.error(f"Invalid status values: {invalid}")
-            raise HTTPException(
-                status_code=400,
-                detail=(f"Invalid status value(s): {', '.join(invalid)}. "
-                        f"Allowed: {', '.join(ALLOWED_STATUSES)}"),
+    filters = build_filters(filter_params)
+    if_none_match = None if explain else request.headers.get("if-none-match")
+    cost = charge_search_cost(organization_id, filters, bool(if_none_match))
+
+    with handle_errors("search"):
+        if explain:
+            return await search_executor.run(
+                run_explain, organization_id, filters, tenant=organization_id, cost=cost
             )
-        filters["status"] = status
+        etag, body = await search_executor.run(
+            run_search, organization_id, filters, cursor, page, page_size,
+            None, None, if_none_match, tenant=organization_id, cost=cost,
+        )
+        if body is None:
+            return not_modified(etag)
+        charge_full_cost(organization_id, cost, bool(if_none_match))
+        return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
-    if department:
-        filters["department"] = department
-    if position:
-        filters["position"] = position
-    if location:
-        filters["location"] = location
-    if search:
-        filters["search"] = search 
+def run_export(organization_id: int, filters: dict, if_none_match: str = None):
+    service = EmployeeSearchService(organization_id, filters)
+    etag = service.etag("export")
+    if etag_matches(if_none_match, etag):
+        return etag, None
+    return etag, service.export()
 
-    try:
-        result, total = EmployeeSearchService(organization_id, filters).run(page, page_size)
+@log_json_exceptions
+@app.get("/resource/employees/export")
+async def export(
+    request: Request,
+    organization_id: int = Query(..., description="Organization ID"),
+    filter_params: SearchFilters = Depends(),
+):
+    ip = request.client.host
+    logger.info("Export requested from IP: %s, org_id: %s", ip, organization_id)
+
+    await enforce_rate_limit(organization_id, ip)
+
+    filters = build_filters(filter_params)
+    if_none_match = request.headers.get("if-none-match")
+    cost = charge_search_cost(organization_id, filters, bool(if_none_match))
+
+    with handle_errors("export"):
+        # Only filtering runs on the search pool; chunks are encoded as the
+        # client reads them, so a slow client pauses the generator
+        etag, chunks = await search_executor.run(
+            run_export, organization_id, filters, if_none_match, tenant=organization_id, cost=cost,
+        )
+        if chunks is None:
+            return not_modified(etag)
+        charge_full_cost(organization_id, cost, bool(if_none_match))
+        return StreamingResponse(chunks, media_type="application/x-ndjson", headers={"ETag": etag})
+
+def run_facets(organization_id: int, filters: dict, if_none_match: str = None):
+    service = EmployeeSearchService(organization_id, filters)
+    etag = service.etag("facets")
+    if etag_matches(if_none_match, etag):
+        return etag, None
+    return etag, service.facets()
+
+@log_json_exceptions
+@app.get("/resource/employees/facets")
+async def facets(
+    request: Request,
+    organization_id: int = Query(..., description="Organization ID"),
+    filter_params: SearchFilters = Depends(),
+):
+    ip = request.client.host
+    logger.info("Facets requested from IP: %s, org_id: %s", ip, organization_id)
+
+    await enforce_rate_limit(organization_id, ip)
+
+    filters = build_filters(filter_params)
+    if_none_match = request.headers.get("if-none-match")
+    cost = charge_search_cost(organization_id, filters, bool(if_none_match))
+
+    with handle_errors("facets"):
+        etag, result = await search_executor.run(
+            run_facets, organization_id, filters, if_none_match, tenant=organization_id, cost=cost,
+        )
+        if result is None:
+            return not_modified(etag)
+        charge_full_cost(organization_id, cost, bool(if_none_match))
+        return JSONResponse(result, headers={"ETag": etag})
+
+def run_batch_search(specs: List[SearchSpec], limited_orgs: dict) -> bytes:
+    """
+    Runs every spec against one store view, sharing index lookups between
+    specs of the same organization. A failing spec yields an error entry in
+    its slot instead of failing the whole batch.
+    """
+    view = employee_store.view()
+    lookups = {}
+    parts = []
+    for spec in specs:
+        try:
+            if spec.organization_id in limited_orgs:
+                raise HTTPException(status_code=429, detail=limited_orgs[spec.organization_id])
+            if spec.page < 1 or not 1 <= spec.page_size <= 100:
+                raise HTTPException(status_code=400, detail="page must be >= 1 and page_size between 1 and 100")
+            filters = build_filters(spec)
+            _, body = run_search(spec.organization_id, filters, spec.cursor, spec.page, spec.page_size, view, lookups)
+            parts.append(b'{"status":200,"result":' + body + b"}")
+        except HTTPException as http_err:
+            parts.append(json.dumps({"status": http_err.status_code, "detail": http_err.detail}).encode())
+        except Exception as e:
+            logger.error(f"Unexpected error during batch search: {str(e)}")
+            parts.append(json.dumps({"status": 500, "detail": f"Internal server error: {str(e)}"}).encode())
+    return b'{"version":%d,"results":[' % view.version + b",".join(parts) + b"]}"
+
+@log_json_exceptions
+@app.post("/resource/employees/search/batch")
+async def batch_search(request: Request, specs: List[SearchSpec]):
+    ip = request.client.host
+    logger.info("Batch search of %s queries requested from IP: %s", len(specs), ip)
+
+    if not specs or len(specs) > BATCH_MAX_QUERIES:
+        logger.error(f"Invalid batch size: {len(specs)}")
+        raise HTTPException(
+            status_code=400, detail=f"A batch must contain between 1 and {BATCH_MAX_QUERIES} queries"
+        )
+
+    # One rate-limit hit per organization in the batch, not per query. The
+    # cost budget is charged once per organization with the summed cost of
+    # its valid queries; invalid ones and unknown organizations fail on
+    # their own inside the batch
+    costs = {}
+    for spec in specs:
+        if employee_store.get_organization(spec.organization_id) is None:
+            continue
+        try:
+            filters = build_filters(spec)
+        except HTTPException:
+            continue
+        costs[spec.organization_id] = costs.get(spec.organization_id, 0.0) + search_cost(spec.organization_id, filters)
+
+    limited_orgs = {}
+    for organization_id in {spec.organization_id for spec in specs}:
+        limited = await rate_limited(organization_id, ip)
+        if limited:
+            logger.warning(f"Rate limit exceeded for IP: {ip}, org_id: {organization_id}")
+            limited_orgs[organization_id] = "Rate limit exceeded"
+        elif organization_id in costs and cost_budget.charge(organization_id, costs[organization_id]):
+            logger.warning(f"Search cost budget exceeded for org_id: {organization_id}")
+            limited_orgs[organization_id] = "Search cost budget exceeded"
+
+    # Scheduled on behalf of the organization contributing most of the work
+    charged = {org: cost for org, cost in costs.items() if org not in limited_orgs}
+    tenant = max(charged, key=charged.get) if charged else None
+    body = await search_executor.run(
+        run_batch_search, specs, limited_orgs, tenant=tenant, cost=sum(charged.values()) or 1.0
+    )
+    return Response(content=body, media_type="application/json")
+
+@log_json_exceptions
+@app.get("/resource/employees/autocomplete")
+async def autocomplete(
+    request: Request,
+    organization_id: int = Query(..., description="Organization ID"),
+    prefix: str = Query(..., min_length=1, description="Prefix of first or last name"),
+    limit: int = Query(10, ge=1, le=50, description="Maximum number of suggestions"),
+):
+    ip = request.client.host
+    logger.info("Autocomplete requested from IP: %s, org_id: %s", ip, organization_id)
+
+    await enforce_rate_limit(organization_id, ip)
+
+    with handle_errors("autocomplete"):
+        result = EmployeeSearchService(organization_id, {}).autocomplete(prefix, limit)
         return {
             "results": result,
-            "page": page,
-            "page_size": page_size,
-            "total": total
+            "prefix": prefix,
+            "limit": limit
         }
-    except HTTPException as http_err:
-        logger.error(f"HTTP error during employee search. Reason: {http_err.detail}")
-        raise http_err
-    except Exception as e:
-        logger.error(f"Unexpected error during employee search: {str(e)}")
+
+def require_writable():
+    # Writes only reach this worker's in-memory store; refuse them when
+    # other workers serve the same data and would never see them
+    if employee_store.read_only:
+        logger.error(f"Rejected write: {employee_store.read_only}")
+        raise HTTPException(status_code=409, detail=f"Writes are disabled: {employee_store.read_only}")
+
+@log_json_exceptions
+@app.put("/resource/employees")
+def upsert_employees(employees: List[Employee]):
+    require_writable()
+    # Filter values are stripped before matching, so the stored categorical
+    # values must be too or they could never be matched
+    for employee in employees:
+        for field in ("status", "department", "position", "location"):
+            setattr(employee, field, getattr(employee, field).strip())
+    invalid = sorted({e.status for e in employees if e.status.lower() not in ALLOWED_STATUSES})
+    if invalid:
+        logger.error(f"Invalid status values: {invalid}")
         raise HTTPException(
-            status_code=500, detail=f"Internal server error: {str(e)}"
+            status_code=400,
+            detail=(f"Invalid status value(s): {', '.join(invalid)}. "
+                    f"Allowed: {', '.join(ALLOWED_STATUSES)}"),
         )
+    try:
+        version = employee_store.upsert_employees(employees)
+    except ValueError as e:
+        logger.error(f"Rejected employee upsert: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+    logger.info(f"Upserted {len(employees)} employees (version {version})")
+    return {"upserted": len(employees), "version": version}
+
+@log_json_exceptions
+@app.delete("/resource/employees/{employee_id}")
+def delete_employee(employee_id: int):
+    require_writable()
+    if not employee_store.delete_employee(employee_id):
+        logger.error(f"Employee not found: {employee_id}")
+        raise HTTPException(status_code=404, detail=f"Invalid employee ID: {employee_id}")
+    logger.info(f"Deleted employee {employee_id} (version {employee_store.version})")
+    return {"deleted": employee_id, "version": employee_store.version}
+
+@log_json_exceptions
+@app.put("/resource/organizations")
+def upsert_organizations(organizations: List[Organization]):
+    require_writable()
+    version = employee_store.upsert_organizations(organizations)
+    logger.info(f"Upserted {len(organizations)} organizations (version {version})")
+    return {"upserted": len(organizations), "version": version}
+
+@log_json_exceptions
+@app.delete("/resource/organizations/{organization_id}")
+def delete_organization(organization_id: int):
+    require_writable()
+    if not employee_store.delete_organization(organization_id):
+        logger.error(f"Organization not found: {organization_id}")
+        raise HTTPException(status_code=404, detail=f"Invalid organization ID: {organization_id}")
+    logger.info(f"Deleted organization {organization_id} (version {employee_store.version})")
+    return {"deleted": organization_id, "version": employee_store.version}
 
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+@app.get("/health/cache")
+def cache_stats():
+    return query_cache.stats()
+
+@app.get("/health/executor")
+def executor_stats():
+    return search_executor.stats()
+
+@app.get("/metrics")
+def metrics():
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/health/logging")
+def logging_stats():
+    return get_log_stats()
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+from typing import Annotated, Optional
+from fastapi import Query
+
+@dataclass(slots=True)
+class SearchFilters:
+    """
+    Filters accepted by the search, export, facets and batch endpoints. The
+    GET endpoints read them from the query string (`Depends()`), batch specs
+    inherit them, so a new filter is declared only here.
+    """
+    search: Annotated[Optional[str], Query(description="Search term for first or last name")] = None
+    status: Annotated[Optional[str], Query(description="Employee status (active,not started,terminated)")] = None
+    department: Annotated[
+        Optional[str], Query(description="Department name(ex:-AcmeCorp), or comma-separated names")
+    ] = None
+    position: Annotated[Optional[str], Query(description="Job position, or comma-separated positions")] = None
+    location: Annotated[Optional[str], Query(description="Employee location, or comma-separated locations")] = None
+    not_status: Annotated[Optional[str], Query(description="Comma-separated statuses to exclude")] = None
+    not_department: Annotated[Optional[str], Query(description="Comma-separated departments to exclude")] = None
+    not_position: Annotated[Optional[str], Query(description="Comma-separated positions to exclude")] = None
+    not_location: Annotated[Optional[str], Query(description="Comma-separated locations to exclude")] = None
+
+@dataclass(slots=True, kw_only=True)
+class SearchSpec(SearchFilters):
+    organization_id: int
+    page: int = 1
+    page_size: int = 10
+    cursor: Optional[str] = None
@@ -0,0 +1,110 @@
+import argparse
+import logging
+import time
+from app.common.employee_utils import EmployeeSearchService
+from app.common.limit_utils import MemoryBackend, RateLimiter
+from app.common.logging_config import get_json_logger
+from app.common.query_cache import query_cache
+from benchmarks.common import build_store, environment, summarize, use_store, write_report
+
+FILTERS = {
+    "broad": {"status": "active"},
+    "selective": {"location": "Amsterdam"},
+    "combined": {"department": "Engineering", "status": "active,not started", "position": "Lead"},
+    "name": {"search": "sha", "status": "active"},
+}
+
+
+def measure(fn, iterations: int, warmup: int, setup=None) -> dict:
+    """
+    Times `iterations` calls of `fn` after `warmup` untimed calls. `setup`
+    runs untimed before every call.
+    """
+    for _ in range(warmup):
+        if setup:
+            setup()
+        fn()
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        started = time.perf_counter_ns()
+        fn()
+        samples.append(time.perf_counter_ns() - started)
+    return summarize(samples)
+
+
+def run_benchmarks(store, iterations: int, warmup: int) -> dict:
+    # The largest organization stresses the search path the most
+    org_id = max(store.partitions, key=lambda org: len(store.partitions[org]))
+    results = {}
+
+    for name, filters in FILTERS.items():
+        results[f"apply_filters.{name}"] = measure(
+            lambda: EmployeeSearchService(org_id, dict(filters))._apply_filters(), iterations, warmup
+        )
+        results[f"run.cold.{name}"] = measure(
+            lambda: EmployeeSearchService(org_id, dict(filters)).run(page=5, page_size=100),
+            iterations, warmup, setup=query_cache.clear,
+        )
+        results[f"run_json.cold.{name}"] = measure(
+            lambda: EmployeeSearchService(org_id, dict(filters)).run_json(page=5, page_size=100),
+            iterations, warmup, setup=query_cache.clear,
+        )
+        results[f"run.cached.{name}"] = measure(
+            lambda: EmployeeSearchService(org_id, dict(filters)).run(page=5, page_size=100), iterations, warmup
+        )
+
+    service = EmployeeSearchService(org_id, {})
+    rows = service.partition.rows(range(100))
+    results["format_output.100"] = measure(lambda: service._format_output(rows), iterations, warmup)
+
+    limiter = RateLimiter(MemoryBackend())
+    clients = iter(range(10 ** 9))
+    results["is_rate_limited.distinct_ips"] = measure(
+        lambda: limiter.is_rate_limited(org_id, f"10.0.{next(clients) % 65536}"), iterations, warmup
+    )
+    results["is_rate_limited.same_ip"] = measure(
+        lambda: limiter.is_rate_limited(org_id, "10.0.0.1"), iterations, warmup
+    )
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Microbenchmarks for the employee search path.")
+    parser.add_argument("--employees", type=int, default=200_000, help="Number of generated employees")
+    parser.add_argument("--organizations", type=int, default=100, help="Number of generated organizations")
+    parser.add_argument("--seed", type=int, default=0, help="Dataset seed")
+    parser.add_argument("--iterations", type=int, default=200, help="Timed calls per benchmark")
+    parser.add_argument("--warmup", type=int, default=20, help="Untimed calls per benchmark")
+    parser.add_argument("--log-level", default="WARNING", help="Level of the service logs while benchmarking")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed slowdown before a regression is flagged")
+    args = parser.parse_args(argv)
+    get_json_logger().setLevel(getattr(logging, args.log_level.upper()))
+
+    started = time.perf_counter()
+    store = build_store(args.employees, args.organizations, args.seed)
+    build_seconds = time.perf_counter() - started
+
+    with use_store(store):
+        results = run_benchmarks(store, args.iterations, args.warmup)
+
+    report = {
+        "benchmark": "search",
+        "environment": environment(),
+        "dataset": {
+            "employees": args.employees,
+            "organizations": args.organizations,
+            "seed": args.seed,
+            "build_seconds": round(build_seconds, 2),
+        },
+        "log_level": args.log_level.upper(),
+        "results": results,
+    }
+    return write_report(report, args.output, args.baseline, args.threshold)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,104 @@
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from unittest.mock import patch
+from app.common.employee_store import EmployeeStore
+from app.common.query_cache import query_cache
+from app.employee_data.generator import generate_organizations, iter_generated_employees
+
+
+def build_store(employee_count: int, organization_count: int, seed: int) -> EmployeeStore:
+    organizations = generate_organizations(organization_count)
+    return EmployeeStore(iter_generated_employees(employee_count, organizations, seed), organizations)
+
+
+@contextmanager
+def use_store(store: EmployeeStore):
+    """
+    Serves `store` to the search service and the API for the duration of the
+    block, the same way the tests swap in their fixture stores.
+    """
+    with patch("app.common.employee_utils.employee_store", store), patch("app.main.employee_store", store):
+        query_cache.clear()
+        yield store
+    query_cache.clear()
+
+
+def summarize(samples_ns: list) -> dict:
+    """
+    Returns latency statistics in microseconds for a list of nanosecond
+    samples.
+    """
+    samples = sorted(samples_ns)
+
+    def percentile(p):
+        return samples[min(len(samples) - 1, math.ceil(p / 100 * len(samples)) - 1)] / 1000
+
+    mean = statistics.fmean(samples) / 1000
+    return {
+        "count": len(samples),
+        "mean_us": round(mean, 2),
+        "min_us": round(samples[0] / 1000, 2),
+        "p50_us": round(percentile(50), 2),
+        "p95_us": round(percentile(95), 2),
+        "p99_us": round(percentile(99), 2),
+        "ops_per_sec": round(1_000_000 / mean, 1) if mean else None,
+    }
+
+
+def environment() -> dict:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Returns the names of the results whose mean latency regressed by more than
+    `threshold` (a fraction) against the baseline report's results.
+    """
+    regressions = []
+    for name, result in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous or not previous.get("mean_us"):
+            continue
+        result["baseline_mean_us"] = previous["mean_us"]
+        result["change"] = round(result["mean_us"] / previous["mean_us"] - 1, 3)
+        if result["change"] > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def write_report(report: dict, output: str = None, baseline: str = None, threshold: float = 0.1) -> int:
+    """
+    Writes `report` as JSON to `output` (stdout when None), annotated with
+    the change against `baseline` when given. Returns the process exit code:
+    1 when any result regressed by more than `threshold`.
+    """
+    regressions = []
+    if baseline:
+        with open(baseline, encoding="utf-8") as f:
+            regressions = compare(report["results"], json.load(f), threshold)
+        report["regressions"] = regressions
+
+    body = json.dumps(report, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(body + "\n")
+    else:
+        sys.stdout.write(body + "\n")
+    return 1 if regressions else 0
@@ -0,0 +1,160 @@
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+from collections import Counter, defaultdict
+from contextlib import ExitStack
+from unittest.mock import patch
+import httpx
+from app.common.logging_config import get_json_logger
+from app.employee_data.generator import DEPARTMENTS, FIRST_NAMES, LOCATIONS, POSITIONS, STATUSES
+from app.main import app
+from benchmarks.common import build_store, environment, summarize, use_store, write_report
+
+SEARCH_PATH = "/resource/employees/search"
+
+
+def generate_traffic(count: int, organization_count: int, seed: int) -> list:
+    """
+    Returns `count` reproducible requests in the traffic file format: one
+    `{"method", "path", "params", "json"}` object per request. Organizations
+    are picked with the same skew as the generated data, so large tenants
+    receive most of the traffic.
+    """
+    rng = random.Random(seed)
+    org_ids = list(range(1, organization_count + 1))
+    org_weights = [1 / rank for rank in org_ids]
+
+    def filters():
+        params = {}
+        if rng.random() < 0.6:
+            params["department"] = rng.choice(DEPARTMENTS)
+        if rng.random() < 0.5:
+            params["status"] = ",".join(rng.sample([s.lower() for s in STATUSES], rng.randint(1, 2)))
+        if rng.random() < 0.2:
+            params["position"] = rng.choice(POSITIONS)
+        if rng.random() < 0.2:
+            params["location"] = rng.choice(LOCATIONS)
+        if rng.random() < 0.2:
+            params["search"] = rng.choice(FIRST_NAMES)[:rng.randint(2, 4)].lower()
+        return params
+
+    traffic = []
+    for _ in range(count):
+        org_id = rng.choices(org_ids, weights=org_weights)[0]
+        kind = rng.random()
+        if kind < 0.6:
+            params = {"organization_id": org_id, **filters(), "page": rng.randint(1, 5), "page_size": 50}
+            traffic.append({"method": "GET", "path": SEARCH_PATH, "params": params})
+        elif kind < 0.75:
+            params = {"organization_id": org_id, **filters(), "page_size": 100, "cursor": ""}
+            traffic.append({"method": "GET", "path": SEARCH_PATH, "params": params})
+        elif kind < 0.9:
+            params = {"organization_id": org_id, "prefix": rng.choice(FIRST_NAMES)[:2], "limit": 10}
+            traffic.append({"method": "GET", "path": "/resource/employees/autocomplete", "params": params})
+        elif kind < 0.97:
+            params = {"organization_id": org_id, **filters()}
+            traffic.append({"method": "GET", "path": "/resource/employees/facets", "params": params})
+        else:
+            body = [{"organization_id": org_id, **filters()} for _ in range(10)]
+            traffic.append({"method": "POST", "path": f"{SEARCH_PATH}/batch", "json": body})
+    return traffic
+
+
+def read_traffic(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+async def replay(traffic: list, concurrency: int) -> dict:
+    """
+    Sends every request in `traffic` to the ASGI app in-process with at most
+    `concurrency` requests in flight, and returns latency statistics and
+    status counts per endpoint plus overall throughput.
+    """
+    samples = defaultdict(list)
+    statuses = defaultdict(Counter)
+    pending = iter(traffic)
+
+    async def worker(client):
+        for request in pending:
+            endpoint = f"{request.get('method', 'GET')} {request['path']}"
+            started = time.perf_counter_ns()
+            response = await client.request(
+                request.get("method", "GET"), request["path"],
+                params=request.get("params"), json=request.get("json"),
+            )
+            samples[endpoint].append(time.perf_counter_ns() - started)
+            statuses[endpoint][response.status_code] += 1
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://load-driver") as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    results = {}
+    for endpoint, endpoint_samples in samples.items():
+        results[endpoint] = summarize(endpoint_samples)
+        results[endpoint]["statuses"] = {str(code): count for code, count in sorted(statuses[endpoint].items())}
+    return {
+        "requests": len(traffic),
+        "seconds": round(elapsed, 3),
+        "requests_per_sec": round(len(traffic) / elapsed, 1) if elapsed else None,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay search traffic against the ASGI app in-process.")
+    parser.add_argument("--traffic", help="JSONL traffic file; generated from --seed when omitted")
+    parser.add_argument("--save-traffic", help="Write the replayed traffic to this JSONL file")
+    parser.add_argument("--requests", type=int, default=5000, help="Number of generated requests")
+    parser.add_argument("--concurrency", type=int, default=32, help="Requests in flight")
+    parser.add_argument("--employees", type=int, default=200_000, help="Number of generated employees")
+    parser.add_argument("--organizations", type=int, default=100, help="Number of generated organizations")
+    parser.add_argument("--seed", type=int, default=0, help="Dataset and traffic seed")
+    parser.add_argument("--respect-rate-limits", action="store_true",
+                        help="Apply the per-org rate limits and cost budgets instead of disabling them")
+    parser.add_argument("--log-level", default="WARNING", help="Level of the service logs while replaying")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.1, help="Allowed slowdown before a regression is flagged")
+    args = parser.parse_args(argv)
+    get_json_logger().setLevel(getattr(logging, args.log_level.upper()))
+
+    if args.traffic:
+        traffic = read_traffic(args.traffic)
+    else:
+        traffic = generate_traffic(args.requests, args.organizations, args.seed)
+    if args.save_traffic:
+        with open(args.save_traffic, "w", encoding="utf-8") as f:
+            f.writelines(json.dumps(request) + "\n" for request in traffic)
+
+    store = build_store(args.employees, args.organizations, args.seed)
+    with ExitStack() as stack:
+        stack.enter_context(use_store(store))
+        if not args.respect_rate_limits:
+            # Replayed traffic comes from one client address and would
+            # otherwise be throttled after a handful of requests
+            stack.enter_context(patch("app.main.is_rate_limited", return_value=False))
+            stack.enter_context(patch("app.main.cost_budget.charge", return_value=0.0))
+        summary = asyncio.run(replay(traffic, args.concurrency))
+
+    report = {
+        "benchmark": "load",
+        "environment": environment(),
+        "dataset": {"employees": args.employees, "organizations": args.organizations, "seed": args.seed},
+        "traffic": args.traffic or "generated",
+        "concurrency": args.concurrency,
+        "rate_limited": args.respect_rate_limits,
+        "log_level": args.log_level.upper(),
+        **summary,
+    }
+    return write_report(report, args.output, args.baseline, args.threshold)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
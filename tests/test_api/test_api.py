@@ -1,17 +1,30 @@
 import unittest
+import json
 import sys
 import os
+import tempfile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.testclient import TestClient
 
 # Adjust sys.path for relative import
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+from unittest.mock import patch
 from app.main import app
+from app.common import limit_utils
+from app.common.employee_store import EmployeeStore
+from app.common.employee_utils import EmployeeSearchService
+from app.employee_data.employee_data import employees, organizations
+from app.models.employee import Employee
 
 client = TestClient(app)
 
 class TestSearchAPI(unittest.TestCase):
 
+    def setUp(self):
+        limit_utils.rate_limiter.reset()
+        limit_utils.cost_budget.reset()
+
     def test_search_by_department(self):
         response = client.get("/resource/employees/search", params={
             "organization_id": 1,
@@ -92,6 +105,334 @@ class TestSearchAPI(unittest.TestCase):
         for emp in results:
             self.assertTrue("aarav" in emp["first_name"].lower() or "aarav" in emp["last_name"].lower())
 
+    def test_cursor_pagination_walks_all_results(self):
+        params = {"organization_id": 1, "status": "active", "page_size": 4, "cursor": ""}
+        seen = []
+        while True:
+            response = client.get("/resource/employees/search", params=params)
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            seen.extend(emp["first_name"] for emp in body["results"])
+            if body["next_cursor"] is None:
+                break
+            params["cursor"] = body["next_cursor"]
+            limit_utils.rate_limiter.reset()
+
+        self.assertEqual(len(seen), body["total"])
+        self.assertEqual(len(set(seen)), len(seen))
+
+    def test_invalid_cursor(self):
+        response = client.get("/resource/employees/search", params={
+            "organization_id": 1,
+            "cursor": "not-a-cursor",
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Invalid cursor", response.json()["detail"])
+
+    def test_autocomplete_by_prefix(self):
+        response = client.get("/resource/employees/autocomplete", params={
+            "organization_id": 1,
+            "prefix": "Aa",
+            "limit": 5
+        })
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertTrue(len(results) > 0)
+        for emp in results:
+            self.assertTrue(emp["first_name"].lower().startswith("aa") or emp["last_name"].lower().startswith("aa"))
+
+    def test_autocomplete_respects_org_column_config(self):
+        response = client.get("/resource/employees/autocomplete", params={
+            "organization_id": 2,
+            "prefix": "z",
+        })
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertTrue(len(results) > 0)
+        for emp in results:
+            self.assertNotIn("contact_info", emp)
+            self.assertNotIn("location", emp)
+
+    def test_autocomplete_invalid_organization_id(self):
+        response = client.get("/resource/employees/autocomplete", params={
+            "organization_id": 9999,
+            "prefix": "a",
+        })
+        self.assertEqual(response.status_code, 404)
+
+    def test_search_explain_returns_plan(self):
+        response = client.get("/resource/employees/search", params={
+            "organization_id": 1, "department": "HR", "status": "active", "explain": True,
+        })
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual({step["field"] for step in body["plan"]}, {"department", "status"})
+        self.assertEqual(body["plan"][-1]["rows"], body["total"])
+
+    def test_export_streams_filtered_ndjson(self):
+        response = client.get("/resource/employees/export", params={"organization_id": 1, "status": "active"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.headers["content-type"].startswith("application/x-ndjson"))
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        self.assertTrue(len(rows) > 0)
+        for emp in rows:
+            self.assertEqual(emp["status"].lower(), "active")
+
+    def test_export_invalid_organization_id(self):
+        response = client.get("/resource/employees/export", params={"organization_id": 9999})
+        self.assertEqual(response.status_code, 404)
+
+    def test_metrics_expose_stages_and_outcomes(self):
+        client.get("/resource/employees/search", params={"organization_id": 1, "department": "HR"})
+        client.get("/resource/employees/search", params={"organization_id": 1, "status": "retired"})
+
+        response = client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('employee_search_stage_seconds_count{organization_id="1",stage="filter"}', response.text)
+        self.assertIn('employee_search_responses_total{endpoint="/resource/employees/search",outcome="4xx"}', response.text)
+        self.assertIn("employee_search_requests_in_flight", response.text)
+
+    def test_server_timing_header(self):
+        params = {"organization_id": 1, "department": "HR"}
+        self.assertNotIn("server-timing", client.get("/resource/employees/search", params=params).headers)
+
+        with patch("app.main.SERVER_TIMING_ENABLED", True):
+            response = client.get("/resource/employees/search", params=params)
+        self.assertIn("rate_limit;dur=", response.headers["server-timing"])
+        self.assertIn("total;dur=", response.headers["server-timing"])
+
+    def test_search_not_modified_skips_filtering(self):
+        params = {"organization_id": 1, "department": "HR", "page_size": 5}
+        response = client.get("/resource/employees/search", params=params)
+        etag = response.headers["etag"]
+        self.assertTrue(etag.startswith('"'))
+
+        same_query = {"organization_id": 1, "department": "hr", "page_size": 5}
+        with patch.object(EmployeeSearchService, "_apply_filters") as apply_filters:
+            response = client.get("/resource/employees/search", params=same_query, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.headers["etag"], etag)
+        self.assertEqual(response.content, b"")
+        apply_filters.assert_not_called()
+
+        response = client.get("/resource/employees/search", params={**params, "page": 2}, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["etag"], etag)
+
+    def test_facets_and_export_not_modified(self):
+        for path in ("/resource/employees/facets", "/resource/employees/export"):
+            params = {"organization_id": 1, "status": "active"}
+            etag = client.get(path, params=params).headers["etag"]
+            response = client.get(path, params=params, headers={"If-None-Match": f'W/{etag}, "other"'})
+            self.assertEqual(response.status_code, 304)
+
+    def test_facets_count_matching_employees(self):
+        response = client.get("/resource/employees/facets", params={"organization_id": 1, "department": "HR"})
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual(body["facets"]["department"], {"HR": body["total"]})
+        self.assertEqual(sum(body["facets"]["status"].values()), body["total"])
+
+    def test_facets_reject_invalid_status(self):
+        response = client.get("/resource/employees/facets", params={"organization_id": 1, "status": "retired"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_batch_search_returns_results_and_errors_per_query(self):
+        response = client.post("/resource/employees/search/batch", json=[
+            {"organization_id": 1, "department": "HR", "page_size": 5},
+            {"organization_id": 1, "department": "HR", "status": "active", "page_size": 5},
+            {"organization_id": 1, "status": "retired"},
+            {"organization_id": 9999},
+        ])
+        self.assertEqual(response.status_code, 200)
+        results = response.json()["results"]
+        self.assertEqual([r["status"] for r in results], [200, 200, 400, 404])
+        for emp in results[0]["result"]["results"]:
+            self.assertEqual(emp["department"], "HR")
+        self.assertLessEqual(results[1]["result"]["total"], results[0]["result"]["total"])
+        self.assertIn("Invalid organization ID", results[3]["detail"])
+
+    def test_batch_search_rate_limits_once_per_organization(self):
+        specs = [{"organization_id": 1, "page_size": 1, "page": page} for page in range(1, 11)]
+        response = client.post("/resource/employees/search/batch", json=specs)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(all(r["status"] == 200 for r in response.json()["results"]))
+
+    def test_batch_search_rejects_empty_batch(self):
+        response = client.post("/resource/employees/search/batch", json=[])
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_with_in_list_and_exclusion(self):
+        response = client.get("/resource/employees/search", params={
+            "organization_id": 1,
+            "department": "HR,Engineering",
+            "not_location": "NY",
+            "page_size": 100,
+        })
+        self.assertEqual(response.status_code, 200)
+        for emp in response.json()["results"]:
+            self.assertIn(emp["department"], ("HR", "Engineering"))
+            self.assertNotEqual(emp["location"], "NY")
+
+    def test_invalid_excluded_status(self):
+        response = client.get("/resource/employees/search", params={
+            "organization_id": 1,
+            "not_status": "active,retired",
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("retired", response.json()["detail"])
+
+    def test_cost_budget_exceeded(self):
+        budget = limit_utils.CostBudget({1: {"cost_per_second": 0.5, "burst": 1.5}})
+        with patch("app.main.cost_budget", budget):
+            response = client.get("/resource/employees/search", params={"organization_id": 1})
+            self.assertEqual(response.status_code, 200)
+            response = client.get("/resource/employees/search", params={"organization_id": 1})
+            self.assertEqual(response.status_code, 429)
+            self.assertEqual(response.json()["detail"], "Search cost budget exceeded")
+            self.assertEqual(response.headers["Retry-After"], "2")
+
+            # Other organizations keep their own budget
+            response = client.get("/resource/employees/search", params={"organization_id": 2})
+            self.assertEqual(response.status_code, 200)
+
+    def test_cost_budget_ignores_unknown_organizations(self):
+        budget = limit_utils.CostBudget()
+        with patch("app.main.cost_budget", budget):
+            for organization_id in range(5000, 5020):
+                response = client.get("/resource/employees/search", params={"organization_id": organization_id})
+                self.assertEqual(response.status_code, 404)
+            client.post("/resource/employees/search/batch", json=[{"organization_id": 6000}])
+        self.assertEqual(len(budget), 0)
+
+    def test_not_modified_is_charged_nominal_cost(self):
+        params = {"organization_id": 1}
+        etag = client.get("/resource/employees/search", params=params).headers["etag"]
+        budget = limit_utils.CostBudget({1: {"cost_per_second": 0.001, "burst": 2}})
+        with patch("app.main.cost_budget", budget):
+            for _ in range(2):
+                response = client.get("/resource/employees/search", params=params, headers={"If-None-Match": etag})
+                self.assertEqual(response.status_code, 304)
+            limit_utils.rate_limiter.reset()
+            # Only the nominal cost of the two 304s has been spent
+            response = client.get("/resource/employees/search", params=params, headers={"If-None-Match": '"stale"'})
+            self.assertEqual(response.status_code, 429)
+
+    def test_sqlite_rate_limit_runs_off_the_event_loop(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            limiter = limit_utils.RateLimiter(
+                limit_utils.SQLiteBackend(os.path.join(tmp_dir, "limits.db")), {1: {"max_requests": 1}}
+            )
+            with patch("app.main.rate_limiter", limiter), \
+                    patch("app.main.is_rate_limited", limiter.is_rate_limited), \
+                    patch("app.main.run_in_threadpool", wraps=run_in_threadpool) as threadpool:
+                self.assertEqual(client.get("/resource/employees/search", params={"organization_id": 1}).status_code, 200)
+                self.assertEqual(client.get("/resource/employees/search", params={"organization_id": 1}).status_code, 429)
+            self.assertEqual(threadpool.call_count, 2)
+
+    def test_batch_search_cost_budget_per_org(self):
+        budget = limit_utils.CostBudget({1: {"cost_per_second": 0.001, "burst": 1}})
+        budget.charge(1, 1)
+        with patch("app.main.cost_budget", budget):
+            response = client.post("/resource/employees/search/batch", json=[
+                {"organization_id": 1, "department": "HR"},
+                {"organization_id": 2},
+            ])
+        self.assertEqual(response.status_code, 200)
+        first, second = response.json()["results"]
+        self.assertEqual(first, {"status": 429, "detail": "Search cost budget exceeded"})
+        self.assertEqual(second["status"], 200)
+
+
+class TestWriteAPI(unittest.TestCase):
+
+    def setUp(self):
+        limit_utils.rate_limiter.reset()
+        limit_utils.cost_budget.reset()
+        self.store = store = EmployeeStore(employees, organizations)
+        for target in ("app.main.employee_store", "app.common.employee_utils.employee_store"):
+            patcher = patch(target, store)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def employee(self, **overrides):
+        return {
+            "id": 1000, "first_name": "Zubin", "last_name": "Mehta", "contact_info": "zubin@acmecorp.com",
+            "department": "Legal", "position": "Advisor", "location": "NY", "status": "Active",
+            "organization_id": 1, **overrides,
+        }
+
+    def test_upsert_employee_is_searchable(self):
+        response = client.put("/resource/employees", json=[self.employee()])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["upserted"], 1)
+
+        response = client.get("/resource/employees/search", params={"organization_id": 1, "search": "zubin"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["total"], 1)
+
+    def test_write_changes_etag(self):
+        params = {"organization_id": 1, "department": "HR"}
+        etag = client.get("/resource/employees/search", params=params).headers["etag"]
+
+        client.put("/resource/employees", json=[self.employee(department="HR")])
+        response = client.get("/resource/employees/search", params=params, headers={"If-None-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["etag"], etag)
+
+    def test_upsert_employee_unknown_organization(self):
+        response = client.put("/resource/employees", json=[self.employee(organization_id=9999)])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Unknown organization ID", response.json()["detail"])
+
+    def test_upsert_employee_invalid_status(self):
+        response = client.put("/resource/employees", json=[self.employee(status="Bogus")])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("Bogus", response.json()["detail"])
+        self.assertNotIn("Bogus", client.get("/resource/employees/facets", params={"organization_id": 1})
+                         .json()["facets"]["status"])
+
+    def test_upsert_employee_strips_categorical_values(self):
+        response = client.put("/resource/employees", json=[self.employee(status="Active ", department=" Legal")])
+        self.assertEqual(response.status_code, 200)
+
+        response = client.get("/resource/employees/search", params={
+            "organization_id": 1, "status": "active", "department": "legal",
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([e["status"] for e in response.json()["results"]], ["Active"])
+        facets = client.get("/resource/employees/facets", params={"organization_id": 1}).json()["facets"]
+        self.assertNotIn("Active ", facets["status"])
+        self.assertNotIn(" Legal", facets["department"])
+
+    def test_writes_refused_when_read_only(self):
+        self.store.read_only = "the data is served from a snapshot shared by every worker"
+        response = client.put("/resource/employees", json=[self.employee()])
+        self.assertEqual(response.status_code, 409)
+        self.assertIn("snapshot", response.json()["detail"])
+        self.assertEqual(client.delete("/resource/employees/1").status_code, 409)
+        self.assertEqual(client.put("/resource/organizations", json=[{"id": 6, "name": "Initech"}]).status_code, 409)
+        self.assertEqual(client.delete("/resource/organizations/1").status_code, 409)
+
+        with self.assertRaises(PermissionError):
+            self.store.upsert_employees([Employee(**self.employee())])
+
+    def test_delete_employee(self):
+        self.assertEqual(client.delete("/resource/employees/1").status_code, 200)
+        self.assertEqual(client.delete("/resource/employees/1").status_code, 404)
+
+        response = client.get("/resource/employees/search", params={"organization_id": 1, "search": "Aarav"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_upsert_and_delete_organization(self):
+        response = client.put("/resource/organizations", json=[{"id": 6, "name": "Initech"}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.put("/resource/employees", json=[self.employee(organization_id=6)]).status_code, 200)
+
+        self.assertEqual(client.delete("/resource/organizations/6").status_code, 200)
+        response = client.get("/resource/employees/search", params={"organization_id": 6})
+        self.assertEqual(response.status_code, 404)
+
 
 if __name__ == '__main__':
     unittest.main()
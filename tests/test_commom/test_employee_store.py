@@ -0,0 +1,182 @@
+import unittest
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.common.employee_store import EmployeeStore, OrgPartition, _read_only_reason
+
+
+class TestEmployeeStore(unittest.TestCase):
+    def setUp(self):
+        json_path = Path(__file__).parent.parent / "mock_response/test_employees.json"
+        with open(json_path) as f:
+            self.employees = [SimpleNamespace(**e) for e in json.load(f)]
+        self.employees.append(SimpleNamespace(
+            id=3, first_name="Carol", last_name="White", contact_info="555-666-7777",
+            department="Finance", position="Analyst", location="Austin",
+            status="Active", organization_id=2,
+        ))
+
+        self.organizations = [
+            SimpleNamespace(id=1, name="AcmeCorp"),
+            SimpleNamespace(id=2, name="BetaTech"),
+            SimpleNamespace(id=3, name="Infosys"),
+        ]
+        self.store = EmployeeStore(self.employees, self.organizations)
+
+    def test_get_organization_by_id(self):
+        self.assertEqual(self.store.get_organization(2).name, "BetaTech")
+        self.assertIsNone(self.store.get_organization(999))
+
+    def test_employees_partitioned_by_organization(self):
+        org1 = self.store.get_partition(1)
+        org2 = self.store.get_partition(2)
+
+        self.assertEqual([e.first_name for e in org1.rows(range(len(org1)))], ["Alice", "Bob"])
+        self.assertEqual([e.first_name for e in org2.rows(range(len(org2)))], ["Carol"])
+
+    def test_org_without_employees_returns_empty_partition(self):
+        self.assertEqual(len(self.store.get_partition(3)), 0)
+
+    def test_index_lookup_is_case_insensitive(self):
+        partition = self.store.get_partition(1)
+        self.assertEqual(partition.lookup("department", ["hr"]), {0})
+        self.assertEqual(partition.lookup("status", ["not started"]), {1})
+
+    def test_index_lookup_unions_multiple_values(self):
+        partition = self.store.get_partition(1)
+        self.assertEqual(partition.lookup("status", ["active", "not started"]), {0, 1})
+        self.assertEqual(partition.lookup("location", ["nowhere"]), set())
+
+    def test_search_names_matches_substring_scan(self):
+        partition = self.store.get_partition(1)
+        for term in ["ali", "son", "smith", "o", "li", "xyz", "ceb"]:
+            expected = {
+                row_id for row_id, e in enumerate(partition.rows(range(len(partition))))
+                if term in e.first_name.lower() or term in e.last_name.lower()
+            }
+            self.assertEqual(partition.search_names(term), expected, term)
+
+    def test_prefix_search_uses_first_and_last_names(self):
+        partition = self.store.get_partition(1)
+        self.assertEqual(partition.prefix_search("al", 10), [0])
+        self.assertEqual(partition.prefix_search("j", 10), [1])
+        self.assertEqual(partition.prefix_search("s", 10), [0])
+        self.assertEqual(partition.prefix_search("zz", 10), [])
+
+    def test_prefix_search_respects_limit(self):
+        partition = self.store.get_partition(1)
+        self.assertEqual(len(partition.prefix_search("", 1)), 1)
+
+    def test_rows_materialize_in_requested_order(self):
+        partition = self.store.get_partition(1)
+        self.assertEqual([e.first_name for e in partition.rows([1, 0])], ["Bob", "Alice"])
+
+    def test_rows_after_orders_by_employee_id(self):
+        partition = self.store.get_partition(1)
+        self.assertEqual(partition.rows_after(None, 10), [0, 1])
+        self.assertEqual(partition.rows_after(1, 10), [1])
+        self.assertEqual(partition.rows_after(None, 1), [0])
+        self.assertEqual(partition.rows_after(None, 10, matched={1}), [1])
+        self.assertEqual(partition.rows_after(2, 10), [])
+
+    def test_iter_id_order_sorts_small_match_sets_directly(self):
+        partition = OrgPartition(
+            SimpleNamespace(**{**vars(self.employees[0]), "id": employee_id}) for employee_id in range(40, 0, -1)
+        )
+        self.assertEqual(list(partition.iter_id_order()), list(range(39, -1, -1)))
+        with patch.object(partition, "id_order", side_effect=AssertionError("walked the whole partition")):
+            self.assertEqual(list(partition.iter_id_order({0, 5, 20})), [20, 5, 0])
+        self.assertEqual(list(partition.iter_id_order(set(range(0, 40, 2)))), list(range(38, -1, -2)))
+
+    def test_estimates_and_scans_match_lookups(self):
+        partition = self.store.get_partition(1)
+        self.assertEqual(partition.estimate("status", {"active", "not started"}), 2)
+        self.assertEqual(partition.estimate("first_name", {"alice"}), len(partition))
+        self.assertEqual(partition.estimate_names("ohn"), 1)
+        self.assertEqual(partition.scan("status", {"active"}, partition.all_rows()), partition.lookup("status", ["active"]))
+        self.assertEqual(partition.scan_names("ohn", partition.all_rows()), partition.search_names("ohn"))
+
+    def test_facet_counts_use_live_rows(self):
+        partition = self.store.get_partition(1)
+        self.assertEqual(partition.facet_counts("status"), {"Active": 1, "Not Started": 1})
+        self.assertEqual(partition.facet_counts("department", {1}), {"Engineering": 1})
+
+        self.store.delete_employee(1)
+        self.assertEqual(self.store.get_partition(1).facet_counts("status"), {"Not Started": 1})
+
+    def test_upsert_updates_row_in_place(self):
+        updated = SimpleNamespace(**{**vars(self.employees[0]), "last_name": "Jones", "department": "Legal"})
+        old_view = self.store.view()
+
+        version = self.store.upsert_employees([updated])
+
+        partition = self.store.get_partition(1)
+        self.assertGreater(version, old_view.version)
+        self.assertEqual(partition.rows([0])[0].last_name, "Jones")
+        self.assertEqual(partition.lookup("department", ["legal"]), {0})
+        self.assertEqual(partition.lookup("department", ["hr"]), set())
+        self.assertEqual(partition.search_names("smith"), set())
+        self.assertEqual(partition.prefix_search("jo", 10), [1, 0])
+        # readers holding the previous view are unaffected
+        self.assertEqual(old_view.get_partition(1).lookup("department", ["hr"]), {0})
+
+    def test_postings_stay_sorted_arrays_across_writes(self):
+        hr = SimpleNamespace(**{**vars(self.employees[1]), "department": "HR"})
+        self.store.upsert_employees([hr])
+        self.store.upsert_employees([SimpleNamespace(**{**vars(self.employees[0]), "department": "Legal"})])
+        self.store.upsert_employees([SimpleNamespace(**{**vars(self.employees[0]), "department": "HR"})])
+
+        partition = self.store.get_partition(1)
+        for index in (*partition.indexes.values(), partition.name_grams):
+            for posting in index.values():
+                self.assertEqual(posting.typecode, "I")
+                self.assertEqual(list(posting), sorted(set(posting)))
+        self.assertEqual(list(partition.indexes["department"]["hr"]), [0, 1])
+        self.assertNotIn("legal", partition.indexes["department"])
+        self.assertEqual(partition.search_names("ali"), {0})
+
+    def test_default_store_is_read_only_when_shared(self):
+        with patch.dict("os.environ", {"WEB_CONCURRENCY": "4"}):
+            self.assertIn("several workers", _read_only_reason())
+        with patch.dict("os.environ", {"EMPLOYEE_SNAPSHOT_PATH": "/data/employees.snap"}):
+            self.assertIn("snapshot", _read_only_reason())
+        with patch.dict("os.environ", {"WEB_CONCURRENCY": "1"}, clear=True):
+            self.assertIsNone(_read_only_reason())
+
+    def test_upsert_moves_employee_between_organizations(self):
+        moved = SimpleNamespace(**{**vars(self.employees[1]), "organization_id": 2})
+        self.store.upsert_employees([moved])
+
+        self.assertEqual(len(self.store.get_partition(1)), 1)
+        self.assertEqual(self.store.get_partition(1).search_names("bob"), set())
+        org2 = self.store.get_partition(2)
+        self.assertEqual(sorted(e.first_name for e in org2.rows(org2.all_rows())), ["Bob", "Carol"])
+
+    def test_upsert_rejects_unknown_organization(self):
+        stray = SimpleNamespace(**{**vars(self.employees[0]), "id": 99, "organization_id": 42})
+        version = self.store.version
+        with self.assertRaises(ValueError):
+            self.store.upsert_employees([stray])
+        self.assertEqual(self.store.version, version)
+
+    def test_delete_employee(self):
+        self.assertTrue(self.store.delete_employee(1))
+        self.assertFalse(self.store.delete_employee(1))
+
+        partition = self.store.get_partition(1)
+        self.assertEqual(len(partition), 1)
+        self.assertEqual([e.first_name for e in partition.rows(partition.all_rows())], ["Bob"])
+        self.assertEqual(partition.lookup("status", ["active"]), set())
+        self.assertEqual(partition.prefix_search("al", 10), [])
+
+    def test_delete_organization(self):
+        self.assertTrue(self.store.delete_organization(2))
+        self.assertIsNone(self.store.get_organization(2))
+        self.assertEqual(len(self.store.get_partition(2)), 0)
+        self.assertFalse(self.store.delete_organization(2))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+import json
+from pathlib import Path
+from types import SimpleNamespace
+
+from app.common.employee_table import EmployeeTable
+from app.models.employee import Employee
+
+
+class TestEmployeeTable(unittest.TestCase):
+    def setUp(self):
+        json_path = Path(__file__).parent.parent / "mock_response/test_employees.json"
+        with open(json_path) as f:
+            self.employees = [SimpleNamespace(**e) for e in json.load(f)]
+        self.employees.append(SimpleNamespace(
+            id=3, first_name="Carol", last_name="White", contact_info="555-666-7777",
+            department="HR", position="Analyst", location="New York",
+            status="ACTIVE", organization_id=1,
+        ))
+        self.table = EmployeeTable(self.employees)
+
+    def test_rows_round_trip(self):
+        self.assertEqual(len(self.table), 3)
+        for row_id, source in enumerate(self.employees):
+            self.assertEqual(self.table.row(row_id), Employee(**vars(source)))
+
+    def test_categorical_values_are_dictionary_encoded(self):
+        self.assertEqual(self.table.dictionaries["department"], ["HR", "Engineering"])
+        self.assertEqual(list(self.table.codes["department"]), [0, 1, 0])
+        self.assertIs(self.table.value("location", 0), self.table.value("location", 2))
+
+    def test_folded_shadows(self):
+        self.assertEqual(self.table.folded["status"], ["active", "not started", "active"])
+        self.assertEqual(self.table.folded_last_names, ["smith", "johnson", "white"])
+
+    def test_has_field(self):
+        self.assertTrue(self.table.has_field("contact_info"))
+        self.assertTrue(self.table.has_field("status"))
+        self.assertFalse(self.table.has_field("email"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -5,7 +5,8 @@ from types import SimpleNamespace
 from unittest.mock import patch
 from fastapi import HTTPException
 
-from app.common.employee_utils import EmployeeSearchService
+from app.common.employee_store import EmployeeStore, OrgPartition
+from app.common.employee_utils import EmployeeSearchService, encode_cursor
 
 
 class TestEmployeeSearchService(unittest.TestCase):
@@ -25,12 +26,15 @@ class TestEmployeeSearchService(unittest.TestCase):
             SimpleNamespace(id=2, name="BetaTech")
         ]
 
-    @patch("app.common.employee_utils.employees", new_callable=list)
-    @patch("app.common.employee_utils.organizations", new_callable=list)
+        store_patcher = patch(
+            "app.common.employee_utils.employee_store",
+            EmployeeStore(self.employees, self.organizations),
+        )
+        store_patcher.start()
+        self.addCleanup(store_patcher.stop)
+
     @patch("app.config.organization_fields_config.org_column_config", new_callable=dict)
-    def test_filter_by_department(self, mock_config, mock_orgs, mock_emps):
-        mock_emps.extend(self.employees)
-        mock_orgs.extend(self.organizations)
+    def test_filter_by_department(self, mock_config):
         mock_config.update(self.column_config)
 
         filters = {"department": "HR"}
@@ -40,12 +44,8 @@ class TestEmployeeSearchService(unittest.TestCase):
         for emp in results:
             self.assertEqual(emp["department"], "HR")
 
-    @patch("app.common.employee_utils.employees", new_callable=list)
-    @patch("app.common.employee_utils.organizations", new_callable=list)
     @patch("app.config.organization_fields_config.org_column_config", new_callable=dict)
-    def test_filter_by_multiple_status(self, mock_config, mock_orgs, mock_emps):
-        mock_emps.extend(self.employees)
-        mock_orgs.extend(self.organizations)
+    def test_filter_by_multiple_status(self, mock_config):
         mock_config.update(self.column_config)
 
         filters = {"status": "Active,Not Started"}
@@ -55,12 +55,8 @@ class TestEmployeeSearchService(unittest.TestCase):
         for emp in results:
             self.assertIn(emp["status"].lower(), ["active", "not started"])
 
-    @patch("app.common.employee_utils.employees", new_callable=list)
-    @patch("app.common.employee_utils.organizations", new_callable=list)
     @patch("app.config.organization_fields_config.org_column_config", new_callable=dict)
-    def test_invalid_organization_id(self, mock_config, mock_orgs, mock_emps):
-        mock_emps.extend(self.employees)
-        mock_orgs.extend(self.organizations)
+    def test_invalid_organization_id(self, mock_config):
         mock_config.update(self.column_config)
 
         with self.assertRaises(HTTPException) as ctx:
@@ -68,12 +64,8 @@ class TestEmployeeSearchService(unittest.TestCase):
         self.assertEqual(ctx.exception.status_code, 404)
         self.assertIn("Invalid organization ID", ctx.exception.detail)
 
-    @patch("app.common.employee_utils.employees", new_callable=list)
-    @patch("app.common.employee_utils.organizations", new_callable=list)
     @patch("app.config.organization_fields_config.org_column_config", new_callable=dict)
-    def test_invalid_filter_field(self, mock_config, mock_orgs, mock_emps):
-        mock_emps.extend(self.employees)
-        mock_orgs.extend(self.organizations)
+    def test_invalid_filter_field(self, mock_config):
         mock_config.update(self.column_config)
 
         with self.assertRaises(HTTPException) as ctx:
@@ -81,12 +73,8 @@ class TestEmployeeSearchService(unittest.TestCase):
         self.assertEqual(ctx.exception.status_code, 400)
         self.assertIn("Invalid filter field", ctx.exception.detail)
 
-    @patch("app.common.employee_utils.employees", new_callable=list)
-    @patch("app.common.employee_utils.organizations", new_callable=list)
     @patch("app.config.organization_fields_config.org_column_config", new_callable=dict)
-    def test_no_results_for_valid_filter(self, mock_config, mock_orgs, mock_emps):
-        mock_emps.extend(self.employees)
-        mock_orgs.extend(self.organizations)
+    def test_no_results_for_valid_filter(self, mock_config):
         mock_config.update(self.column_config)
 
         with self.assertRaises(HTTPException) as ctx:
@@ -94,12 +82,153 @@ class TestEmployeeSearchService(unittest.TestCase):
         self.assertEqual(ctx.exception.status_code, 404)
         self.assertIn("No employees found", ctx.exception.detail)
 
-    @patch("app.common.employee_utils.employees", new_callable=list)
-    @patch("app.common.employee_utils.organizations", new_callable=list)
     @patch("app.config.organization_fields_config.org_column_config", new_callable=dict)
-    def test_search_by_name_partial_match(self, mock_config, mock_orgs, mock_emps):
-        mock_emps.extend(self.employees)
-        mock_orgs.extend(self.organizations)
+    def test_combined_filters_intersect(self, mock_config):
+        mock_config.update(self.column_config)
+
+        filters = {"status": "active,not started", "department": "engineering"}
+        results, total = EmployeeSearchService(1, filters).run(page=1, page_size=10)
+
+        self.assertEqual(total, 1)
+        self.assertEqual(results[0]["first_name"], "Bob")
+
+        with self.assertRaises(HTTPException) as ctx:
+            EmployeeSearchService(1, {"department": "HR", "location": "San Francisco"}).run(page=1, page_size=10)
+        self.assertEqual(ctx.exception.status_code, 404)
+        self.assertIn("location = 'San Francisco'", ctx.exception.detail)
+
+    @patch("app.config.organization_fields_config.org_column_config", new_callable=dict)
+    def test_cursor_pagination(self, mock_config):
+        mock_config.update(self.column_config)
+
+        results, total, next_cursor = EmployeeSearchService(1, {}).run_cursor("", page_size=1)
+        self.assertEqual(total, 2)
+        self.assertEqual(results[0]["first_name"], "Alice")
+        self.assertIsNotNone(next_cursor)
+
+        results, total, next_cursor = EmployeeSearchService(1, {}).run_cursor(next_cursor, page_size=1)
+        self.assertEqual(results[0]["first_name"], "Bob")
+        self.assertIsNone(next_cursor)
+
+        with self.assertRaises(HTTPException) as ctx:
+            EmployeeSearchService(2, {}).run_cursor(encode_cursor(1, 1), page_size=1)
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    @patch("app.config.organization_fields_config.org_column_config", new_callable=dict)
+    def test_results_are_cached_per_dataset_version(self, mock_config):
+        mock_config.update(self.column_config)
+        store = EmployeeStore(self.employees, self.organizations)
+
+        with patch("app.common.employee_utils.employee_store", store), \
+                patch.object(EmployeeSearchService, "_apply_filters", autospec=True,
+                             side_effect=EmployeeSearchService._apply_filters) as apply_filters:
+            first = EmployeeSearchService(1, {"status": "Active,Not Started"}).run(page=1, page_size=10)
+            second = EmployeeSearchService(1, {"status": "not started, active"}).run(page=1, page_size=10)
+            self.assertEqual(first, second)
+            self.assertEqual(apply_filters.call_count, 1)
+
+            store.delete_employee(self.employees[0].id)
+            results, total = EmployeeSearchService(1, {"status": "active,not started"}).run(page=1, page_size=10)
+            self.assertEqual(total, 1)
+            self.assertEqual(apply_filters.call_count, 2)
+
+    @patch("app.config.organization_fields_config.org_column_config", new_callable=dict)
+    def test_shared_lookups_are_reused_across_services(self, mock_config):
+        mock_config.update(self.column_config)
+        store = EmployeeStore(self.employees, self.organizations)
+        view, lookups = store.view(), {}
+
+        with patch.object(OrgPartition, "lookup", autospec=True, side_effect=OrgPartition.lookup) as lookup:
+            _, first_total = EmployeeSearchService(1, {"department": "HR"}, view, lookups).run(page=1, page_size=1)
+            _, second_total = EmployeeSearchService(1, {"department": "hr"}, view, lookups).run(page=1, page_size=2)
+
+        self.assertEqual(first_total, second_total)
+        self.assertEqual(lookup.call_count, 1)
+
+    def test_etag_depends_on_normalized_query_and_column_config(self):
+        etag = EmployeeSearchService(1, {"status": "Active,Not Started"}).etag("page", 1, 10)
+
+        self.assertEqual(EmployeeSearchService(1, {"status": "not started, active"}).etag("page", 1, 10), etag)
+        self.assertNotEqual(EmployeeSearchService(1, {"status": "active"}).etag("page", 1, 10), etag)
+        self.assertNotEqual(EmployeeSearchService(1, {"status": "Active,Not Started"}).etag("page", 2, 10), etag)
+        with patch.dict("app.common.employee_utils.org_column_config", {1: ["first_name"]}):
+            self.assertNotEqual(EmployeeSearchService(1, {"status": "Active,Not Started"}).etag("page", 1, 10), etag)
+
+    def test_etag_depends_on_dataset_not_process_version(self):
+        def etag(store):
+            with patch("app.common.employee_utils.employee_store", store):
+                return EmployeeSearchService(1, {}).etag("page", 1, 2)
+
+        changed = [SimpleNamespace(**{**vars(self.employees[0]), "first_name": "Alicia"}), *self.employees[1:]]
+        same = etag(EmployeeStore(self.employees, self.organizations))
+        self.assertEqual(etag(EmployeeStore(self.employees, self.organizations)), same)
+        self.assertNotEqual(etag(EmployeeStore(changed, self.organizations)), same)
+
+        written = EmployeeStore(self.employees, self.organizations)
+        written.upsert_employees([changed[0]])
+        self.assertNotEqual(etag(written), same)
+
+    def test_write_to_another_org_keeps_etag_and_cache(self):
+        store = EmployeeStore(self.employees, self.organizations)
+        with patch("app.common.employee_utils.employee_store", store):
+            before = EmployeeSearchService(1, {}).etag("page", 1, 2)
+            partition = store.get_partition(1)
+            store.upsert_employees([SimpleNamespace(**{**vars(self.employees[0]), "id": 3, "organization_id": 2})])
+
+            self.assertIs(store.get_partition(1), partition)
+            self.assertEqual(EmployeeSearchService(1, {}).etag("page", 1, 2), before)
+            self.assertNotEqual(store.get_partition(2).version, partition.version)
+
+    def test_planner_runs_most_selective_filter_first(self):
+        service = EmployeeSearchService(1, {"status": "active,not started", "search": "o", "department": "engineering"})
+        result = service.explain()
+
+        self.assertEqual(result["total"], 1)
+        self.assertEqual([step["field"] for step in result["plan"]], ["department", "search", "status"])
+        self.assertEqual([step["strategy"] for step in result["plan"]], ["index", "scan", "scan"])
+        self.assertEqual([step["rows"] for step in result["plan"]], [1, 1, 1])
+
+    def test_planner_stops_at_first_empty_step(self):
+        service = EmployeeSearchService(1, {"status": "active", "location": "Atlantis"})
+        result = service.explain()
+
+        self.assertEqual(result["total"], 0)
+        self.assertEqual([(step["field"], step["rows"]) for step in result["plan"]], [("location", 0)])
+
+        with self.assertRaises(HTTPException) as ctx:
+            EmployeeSearchService(1, {"status": "active", "location": "Atlantis"}).run(page=1, page_size=10)
+        self.assertIn("location = 'Atlantis'", ctx.exception.detail)
+
+    def test_in_list_filters_union_postings(self):
+        results, total = EmployeeSearchService(1, {"department": "HR, engineering"}).run(page=1, page_size=10)
+
+        self.assertEqual(total, 2)
+        self.assertEqual({r["department"] for r in results}, {"HR", "Engineering"})
+
+    def test_negated_filters_subtract_postings(self):
+        service = EmployeeSearchService(1, {"status": "active,not started", "not_department": "HR"})
+        result = service.explain()
+
+        self.assertEqual(result["total"], 1)
+        self.assertEqual([step["field"] for step in result["plan"]], ["not_department", "status"])
+        self.assertEqual([step["rows"] for step in result["plan"]], [1, 1])
+
+        results, total = EmployeeSearchService(1, {"not_location": "new york,boston"}).run(page=1, page_size=10)
+        self.assertEqual(total, 1)
+        self.assertEqual(results[0]["first_name"], "Bob")
+
+    def test_negated_filter_that_excludes_everything(self):
+        with self.assertRaises(HTTPException) as ctx:
+            EmployeeSearchService(1, {"not_status": "active,not started"}).run(page=1, page_size=10)
+        self.assertEqual(ctx.exception.status_code, 404)
+        self.assertIn("not_status", ctx.exception.detail)
+
+        with self.assertRaises(HTTPException) as ctx:
+            EmployeeSearchService(1, {"not_unknown_field": "value"}).run(page=1, page_size=10)
+        self.assertEqual(ctx.exception.status_code, 400)
+
+    @patch("app.config.organization_fields_config.org_column_config", new_callable=dict)
+    def test_search_by_name_partial_match(self, mock_config):
         mock_config.update(self.column_config)
 
         filters = {"search": "ali"}  # Should match Alice
@@ -0,0 +1,120 @@
+import unittest
+import asyncio
+import threading
+import time
+from fastapi import HTTPException
+
+from app.common.executor_utils import SearchExecutor
+
+
+class TestSearchExecutor(unittest.TestCase):
+    def test_inline_mode_runs_on_caller(self):
+        executor = SearchExecutor(mode="inline")
+        self.assertEqual(threading.current_thread().name, asyncio.run(executor.run(lambda: threading.current_thread().name)))
+
+    def test_thread_mode_runs_on_pool(self):
+        executor = SearchExecutor(mode="thread", max_workers=1)
+        name = asyncio.run(executor.run(lambda: threading.current_thread().name))
+        self.assertTrue(name.startswith("search"))
+        self.assertEqual(executor.stats()["pending"], 0)
+
+    def test_errors_propagate(self):
+        executor = SearchExecutor(mode="thread", max_workers=1)
+
+        def fail():
+            raise HTTPException(status_code=404, detail="missing")
+
+        with self.assertRaises(HTTPException) as ctx:
+            asyncio.run(executor.run(fail))
+        self.assertEqual(ctx.exception.status_code, 404)
+
+    def test_sheds_load_when_queue_is_full(self):
+        executor = SearchExecutor(mode="thread", max_workers=1, max_queue=1, timeout_seconds=5)
+        release = threading.Event()
+
+        async def scenario():
+            running = asyncio.ensure_future(executor.run(release.wait))
+            queued = asyncio.ensure_future(executor.run(release.wait))
+            await asyncio.sleep(0.05)
+            with self.assertRaises(HTTPException) as ctx:
+                await executor.run(release.wait)
+            release.set()
+            await asyncio.gather(running, queued)
+            return ctx.exception
+
+        error = asyncio.run(scenario())
+        self.assertEqual(error.status_code, 503)
+        self.assertIn("Retry-After", error.headers)
+        self.assertEqual(executor.stats()["shed"], 1)
+
+    def test_timeout(self):
+        executor = SearchExecutor(mode="thread", max_workers=1, timeout_seconds=0.01)
+        with self.assertRaises(HTTPException) as ctx:
+            asyncio.run(executor.run(time.sleep, 0.2))
+        self.assertEqual(ctx.exception.status_code, 504)
+        self.assertEqual(executor.stats()["timeouts"], 1)
+
+    def test_fair_queuing_serves_light_tenant_first(self):
+        executor = SearchExecutor(mode="thread", max_workers=1, max_queue=10, weights={})
+        release = threading.Event()
+        order = []
+
+        async def scenario():
+            running = asyncio.ensure_future(executor.run(release.wait, tenant="big", cost=10))
+            await asyncio.sleep(0.05)
+            queued = [asyncio.ensure_future(executor.run(order.append, "big", tenant="big", cost=10))
+                      for _ in range(2)]
+            queued.append(asyncio.ensure_future(executor.run(order.append, "small", tenant="small", cost=1)))
+            await asyncio.sleep(0.05)
+            self.assertEqual(executor.stats()["queued"], 3)
+            release.set()
+            await asyncio.gather(running, *queued)
+
+        asyncio.run(scenario())
+        self.assertEqual(order, ["small", "big", "big"])
+        self.assertEqual(executor.stats()["pending"], 0)
+
+    def test_weight_shares_workers(self):
+        executor = SearchExecutor(mode="thread", max_workers=1, max_queue=10, weights={"gold": {"weight": 2}})
+        release = threading.Event()
+        order = []
+
+        async def scenario():
+            running = asyncio.ensure_future(executor.run(release.wait, tenant="other", cost=1))
+            await asyncio.sleep(0.05)
+            queued = [asyncio.ensure_future(executor.run(order.append, tenant, tenant=tenant))
+                      for tenant in ("basic", "basic", "gold", "gold", "gold")]
+            await asyncio.sleep(0.05)
+            release.set()
+            await asyncio.gather(running, *queued)
+
+        asyncio.run(scenario())
+        # Start tags: basic 0, 1; gold 0, 0.5, 1
+        self.assertEqual(order, ["basic", "gold", "gold", "basic", "gold"])
+
+    def test_timed_out_queued_call_never_runs(self):
+        executor = SearchExecutor(mode="thread", max_workers=1, max_queue=1, timeout_seconds=0.05)
+        release = threading.Event()
+        ran = []
+
+        async def scenario():
+            running = asyncio.ensure_future(executor.run(release.wait, 1))
+            await asyncio.sleep(0.01)
+            with self.assertRaises(HTTPException):
+                await executor.run(ran.append, True)
+            release.set()
+            with self.assertRaises(HTTPException):
+                await running
+            await asyncio.sleep(0.05)
+
+        asyncio.run(scenario())
+        self.assertEqual(ran, [])
+        self.assertEqual(executor.stats()["pending"], 0)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            SearchExecutor(mode="fork")
+
+
+if __name__ == "__main__":
+    unittest.main()
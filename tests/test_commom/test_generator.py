@@ -0,0 +1,36 @@
+import unittest
+import tempfile
+from collections import Counter
+
+from app.common.employee_store import load_store
+from app.employee_data.generator import generate_organizations, iter_generated_employees, write_dataset
+
+
+class TestGenerator(unittest.TestCase):
+    def setUp(self):
+        self.organizations = generate_organizations(10)
+
+    def test_same_seed_same_records(self):
+        first = list(iter_generated_employees(200, self.organizations, seed=7))
+        second = list(iter_generated_employees(200, self.organizations, seed=7))
+        other = list(iter_generated_employees(200, self.organizations, seed=8))
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual([e.id for e in first], list(range(1, 201)))
+
+    def test_org_sizes_are_skewed(self):
+        sizes = Counter(e.organization_id for e in iter_generated_employees(5000, self.organizations, seed=1))
+        self.assertGreater(sizes[1], 3 * sizes[10])
+
+    def test_written_dataset_loads(self):
+        with tempfile.TemporaryDirectory() as directory:
+            employees_path, organizations_path = write_dataset(directory, 100, 5, seed=3)
+            store = load_store(employees_path, organizations_path)
+
+        self.assertEqual(len(store), 100)
+        self.assertEqual(len(store.organizations), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,10 @@
 import unittest
 import json
 from unittest.mock import patch
-from collections import defaultdict
+import sqlite3
+import tempfile
 from app.common import limit_utils
-from app.common.constant import MAX_REQUESTS
+from app.common.constant import MAX_REQUESTS, TENANT_COST_BURST, TENANT_COST_PER_SECOND, WINDOW_SECONDS
 from pathlib import Path
 
 class TestRateLimiter(unittest.TestCase):
@@ -14,7 +15,7 @@ class TestRateLimiter(unittest.TestCase):
             cls.test_data = json.load(f)
 
     def setUp(self):
-        limit_utils.request_log = defaultdict(list)
+        limit_utils.rate_limiter.reset()
 
     @patch('time.time', return_value=1000.0)
     def test_allows_requests_below_limit(self, mock_time):
@@ -54,6 +55,116 @@ class TestRateLimiter(unittest.TestCase):
 
         self.assertTrue(limit_utils.is_rate_limited(org_id, ip))
 
+    @patch('time.time')
+    def test_previous_window_is_weighted(self, mock_time):
+        org_id, ip = 'orgW', '3.3.3.3'
+        mock_time.return_value = 1000.0
+        for _ in range(MAX_REQUESTS):
+            self.assertFalse(limit_utils.is_rate_limited(org_id, ip))
+
+        # at the start of the next window the whole previous window still counts
+        mock_time.return_value = 1020.0
+        self.assertTrue(limit_utils.is_rate_limited(org_id, ip))
+
+        # half way through, only half of the previous window's requests count
+        mock_time.return_value = 1050.0
+        self.assertFalse(limit_utils.is_rate_limited(org_id, ip))
+
+    @patch('time.time')
+    def test_idle_keys_are_evicted(self, mock_time):
+        mock_time.return_value = 1000.0
+        for i in range(100):
+            limit_utils.is_rate_limited('orgE', f'10.0.0.{i}')
+        self.assertEqual(len(limit_utils.rate_limiter.backend), 100)
+
+        mock_time.return_value = 1000.0 + 3 * WINDOW_SECONDS
+        limit_utils.is_rate_limited('orgE', '10.0.1.1')
+        self.assertEqual(len(limit_utils.rate_limiter.backend), 1)
+
+    @patch('time.time', return_value=1000.0)
+    def test_per_org_limits(self, mock_time):
+        limiter = limit_utils.RateLimiter(limit_utils.MemoryBackend(), {'orgP': {'max_requests': 2}})
+        self.assertEqual(limiter.limits_for('orgP'), (2, WINDOW_SECONDS))
+        self.assertEqual(limiter.limits_for('other'), (MAX_REQUESTS, WINDOW_SECONDS))
+
+        self.assertFalse(limiter.is_rate_limited('orgP', '1.1.1.1'))
+        self.assertFalse(limiter.is_rate_limited('orgP', '1.1.1.1'))
+        self.assertTrue(limiter.is_rate_limited('orgP', '1.1.1.1'))
+
+    @patch('time.time', return_value=1000.0)
+    def test_sqlite_backend_is_shared_between_limiters(self, mock_time):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = str(Path(tmp_dir) / "limits.db")
+            worker_a = limit_utils.RateLimiter(limit_utils.SQLiteBackend(path), {})
+            worker_b = limit_utils.RateLimiter(limit_utils.SQLiteBackend(path), {})
+
+            for i in range(MAX_REQUESTS):
+                limiter = worker_a if i % 2 else worker_b
+                self.assertFalse(limiter.is_rate_limited('orgS', '4.4.4.4'))
+            self.assertTrue(worker_a.is_rate_limited('orgS', '4.4.4.4'))
+            self.assertTrue(worker_b.is_rate_limited('orgS', '4.4.4.4'))
+
+    @patch('time.time', return_value=1000.0)
+    def test_sqlite_backend_fails_open_while_locked(self, mock_time):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = str(Path(tmp_dir) / "limits.db")
+            limiter = limit_utils.RateLimiter(limit_utils.SQLiteBackend(path), {'orgL': {'max_requests': 1}})
+            self.assertFalse(limiter.is_rate_limited('orgL', '5.5.5.5'))
+
+            other_worker = sqlite3.connect(path, isolation_level=None)
+            other_worker.execute("BEGIN IMMEDIATE")
+            try:
+                self.assertFalse(limiter.is_rate_limited('orgL', '5.5.5.5'))
+            finally:
+                other_worker.execute("ROLLBACK")
+                other_worker.close()
+            self.assertTrue(limiter.is_rate_limited('orgL', '5.5.5.5'))
+
+
+class TestCostBudget(unittest.TestCase):
+
+    @patch('time.monotonic')
+    def test_charges_and_refills(self, mock_time):
+        mock_time.return_value = 100.0
+        budget = limit_utils.CostBudget({'orgC': {'cost_per_second': 10, 'burst': 20}})
+        self.assertEqual(budget.charge('orgC', 15), 0.0)
+        self.assertAlmostEqual(budget.charge('orgC', 10), 0.5)
+
+        mock_time.return_value = 100.5
+        self.assertEqual(budget.charge('orgC', 10), 0.0)
+        self.assertAlmostEqual(budget.charge('orgC', 1), 0.1)
+
+    @patch('time.monotonic', return_value=100.0)
+    def test_cost_above_burst_is_capped(self, mock_time):
+        budget = limit_utils.CostBudget({'orgC': {'cost_per_second': 10, 'burst': 20}})
+        self.assertEqual(budget.charge('orgC', 500), 0.0)
+        self.assertAlmostEqual(budget.charge('orgC', 500), 2.0)
+
+    @patch('time.monotonic')
+    def test_refilled_buckets_are_evicted(self, mock_time):
+        mock_time.return_value = 100.0
+        budget = limit_utils.CostBudget({})
+        for org_id in range(2000):
+            budget.charge(org_id, 10)
+        self.assertEqual(len(budget), 2000)
+
+        mock_time.return_value = 100.0 + 10 / TENANT_COST_PER_SECOND
+        budget.charge('fresh', 1)
+        self.assertEqual(len(budget), 1)
+
+    @patch('time.monotonic')
+    def test_debit_can_overdraw(self, mock_time):
+        mock_time.return_value = 100.0
+        budget = limit_utils.CostBudget({'orgC': {'cost_per_second': 10, 'burst': 20}})
+        budget.debit('orgC', 15)
+        budget.debit('orgC', 15)
+        self.assertAlmostEqual(budget.charge('orgC', 1), 1.1)
+
+    def test_default_quota(self):
+        budget = limit_utils.CostBudget({})
+        self.assertEqual(budget.quota_for('other'), (TENANT_COST_PER_SECOND, TENANT_COST_BURST))
+        self.assertEqual(budget.charge('other', 1), 0.0)
+
 
 if __name__ == '__main__':
     unittest.main()
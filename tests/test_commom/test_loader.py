@@ -0,0 +1,77 @@
+import unittest
+import json
+import tempfile
+from pathlib import Path
+
+from app.common.employee_store import load_store
+from app.employee_data.loader import iter_employees, parse_record
+from app.models.employee import Employee
+from app.models.organization import Organization
+
+
+class TestLoader(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        tmp = Path(self.tmp_dir.name)
+
+        json_path = Path(__file__).parent.parent / "mock_response/test_employees.json"
+        with open(json_path) as f:
+            self.records = json.load(f)
+
+        self.employees_path = tmp / "employees.jsonl"
+        with open(self.employees_path, "w") as f:
+            for record in self.records:
+                f.write(json.dumps(record) + "\n")
+            f.write("\n")
+            f.write(json.dumps({"id": "x", "first_name": "Broken", "organization_id": 1}) + "\n")
+            f.write('{"id": 3, "first_name": "Trunc\n')
+            f.write("[1]\n")
+
+        self.organizations_path = tmp / "organizations.csv"
+        self.organizations_path.write_text("id,name\n1,AcmeCorp\n2,BetaTech\n")
+
+    def test_parse_record_coerces_types(self):
+        org = parse_record(Organization, {"id": "7", "name": "Initech"})
+        self.assertEqual(org, Organization(7, "Initech"))
+
+    def test_parse_record_rejects_missing_fields(self):
+        with self.assertRaises(ValueError):
+            parse_record(Organization, {"id": "7"})
+
+    def test_iter_employees_skips_invalid_rows(self):
+        employees = list(iter_employees(str(self.employees_path)))
+        self.assertEqual(employees, [Employee(**r) for r in self.records])
+
+    def test_load_store_builds_partitions_and_indexes(self):
+        store = load_store(str(self.employees_path), str(self.organizations_path))
+
+        self.assertEqual(store.get_organization(2).name, "BetaTech")
+        partition = store.get_partition(1)
+        self.assertEqual(len(partition), 2)
+        self.assertEqual(partition.lookup("department", ["hr"]), {0})
+        self.assertEqual(partition.prefix_search("bo", 10), [1])
+
+    def test_parse_record_rejects_malformed_json(self):
+        with self.assertRaises(ValueError):
+            parse_record(Organization, '{"id": 7, "name": ')
+        with self.assertRaises(ValueError):
+            parse_record(Organization, "[7]")
+        self.assertEqual(parse_record(Organization, '{"id": 7, "name": "Initech"}'), Organization(7, "Initech"))
+
+    def test_load_store_fingerprint_follows_file_content(self):
+        store = load_store(str(self.employees_path), str(self.organizations_path))
+        self.assertEqual(load_store(str(self.employees_path), str(self.organizations_path)).view().dataset,
+                         store.view().dataset)
+
+        self.organizations_path.write_text("id,name\n1,AcmeCorp\n2,BetaTech\n3,Initech\n")
+        self.assertNotEqual(load_store(str(self.employees_path), str(self.organizations_path)).view().dataset,
+                            store.view().dataset)
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            list(iter_employees(str(Path(self.tmp_dir.name) / "employees.xml")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import json
+import logging
+import queue
+from unittest.mock import patch
+
+from app.common.logging_config import JsonFormatter, NonBlockingQueueHandler, SamplingFilter
+
+
+def make_record(level=logging.INFO, msg="Found %s employees", args=(3,), **extra):
+    record = logging.LogRecord("test", level, __file__, 10, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+
+class TestLoggingConfig(unittest.TestCase):
+    def test_json_formatter_includes_extra_fields(self):
+        output = json.loads(JsonFormatter().format(make_record(org_id=7)))
+
+        self.assertEqual(output["message"], "Found 3 employees")
+        self.assertEqual(output["level"], "INFO")
+        self.assertEqual(output["org_id"], 7)
+        self.assertNotIn("args", output)
+
+    def test_sampling_filter_drops_by_rate(self):
+        log_filter = SamplingFilter(sample_rates={"INFO": 0.0}, rate_limits={})
+        self.assertFalse(log_filter.filter(make_record()))
+        self.assertTrue(log_filter.filter(make_record(level=logging.ERROR)))
+        self.assertEqual(log_filter.dropped, 1)
+
+    @patch("time.monotonic", return_value=100.5)
+    def test_sampling_filter_caps_records_per_second(self, mock_time):
+        log_filter = SamplingFilter(sample_rates={}, rate_limits={"INFO": 2})
+        results = [log_filter.filter(make_record()) for _ in range(3)]
+        self.assertEqual(results, [True, True, False])
+
+        mock_time.return_value = 101.0
+        self.assertTrue(log_filter.filter(make_record()))
+
+    def test_queue_handler_defers_formatting_and_never_blocks(self):
+        handler = NonBlockingQueueHandler(queue.Queue(maxsize=1))
+        record = make_record()
+
+        handler.handle(record)
+        handler.handle(make_record())
+
+        queued = handler.queue.get_nowait()
+        self.assertIs(queued, record)
+        self.assertEqual(queued.args, (3,))
+        self.assertEqual(handler.dropped, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+import asyncio
+
+from app.common.executor_utils import SearchExecutor
+from app.common.metrics import (
+    OVERFLOW_LABEL, Counter, Gauge, Histogram, format_server_timing, outcome, stage, start_request_timings,
+)
+
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram_renders_cumulative_buckets(self):
+        histogram = Histogram("latency_seconds", "Latency.", ("stage",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, "filter")
+        histogram.observe(0.1, "filter")
+        histogram.observe(5, "filter")
+
+        lines = histogram.render()
+        self.assertIn("# TYPE latency_seconds histogram", lines)
+        self.assertIn('latency_seconds_bucket{stage="filter",le="0.1"} 2', lines)
+        self.assertIn('latency_seconds_bucket{stage="filter",le="1.0"} 2', lines)
+        self.assertIn('latency_seconds_bucket{stage="filter",le="+Inf"} 3', lines)
+        self.assertIn('latency_seconds_count{stage="filter"} 3', lines)
+
+    def test_counter_and_gauge(self):
+        counter = Counter("responses_total", "Responses.", ("outcome",))
+        counter.inc(outcome(429))
+        counter.inc(outcome(404))
+        self.assertEqual(counter.value("429"), 1)
+        self.assertEqual(counter.value("4xx"), 1)
+
+        gauge = Gauge("in_flight", "In flight.", ("endpoint",))
+        gauge.inc("/search")
+        gauge.inc("/search")
+        gauge.dec("/search")
+        self.assertIn('in_flight{endpoint="/search"} 1', gauge.render())
+
+    def test_series_beyond_limit_are_folded(self):
+        counter = Counter("requests_total", "Requests.", ("organization_id",), max_series=2)
+        for org_id in range(5):
+            counter.inc(org_id)
+
+        self.assertEqual(counter.value(0), 1)
+        self.assertEqual(counter.value(OVERFLOW_LABEL), 3)
+
+    def test_stage_timings_follow_work_onto_threads(self):
+        executor = SearchExecutor(mode="thread", max_workers=1)
+
+        def work():
+            with stage("filter", 1):
+                pass
+
+        async def request():
+            timings = start_request_timings()
+            await executor.run(work)
+            return timings
+
+        timings = asyncio.run(request())
+        self.assertIn("filter", timings)
+        self.assertRegex(format_server_timing(timings), r"^filter;dur=\d+\.\d{3}$")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import asyncio
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+from app.common.executor_utils import SearchExecutor
+from app.common.profiling import Profiler
+
+
+def busy(n):
+    return sum(i * i for i in range(n))
+
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.output_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.output_dir.cleanup)
+        self.profiler = Profiler(enabled=True, sample_rate=0, output_dir=self.output_dir.name, window_seconds=3600)
+        self.addCleanup(self.profiler.flush)
+        executor = SearchExecutor(mode="thread", max_workers=1)
+        work = self.profiler.profile(busy)
+
+        @self.profiler.profile
+        async def endpoint(request=None):
+            return await executor.run(work, 20000)
+
+        self.endpoint = endpoint
+
+    def request(self, headers):
+        return SimpleNamespace(headers=headers)
+
+    def test_disabled_profiler_returns_function_unchanged(self):
+        self.assertIs(Profiler(enabled=False).profile(busy), busy)
+
+    def test_unsampled_request_records_nothing(self):
+        asyncio.run(self.endpoint(request=self.request({})))
+        self.assertEqual(self.profiler.profiled_requests, 0)
+        self.assertIsNone(self.profiler.flush())
+
+    def test_header_profiles_request_into_collapsed_stacks(self):
+        asyncio.run(self.endpoint(request=self.request({"X-Profile": "1"})))
+        path = self.profiler.flush()
+
+        lines = Path(path).read_text().splitlines()
+        stacks = dict(line.rsplit(" ", 1) for line in lines)
+        self.assertIn("endpoint", stacks)
+        worker_stacks = [stack for stack in stacks if stack.startswith("endpoint;test_profiling.busy")]
+        self.assertTrue(worker_stacks)
+        self.assertTrue(all(int(micros) > 0 for micros in stacks.values()))
+
+    def test_sample_rate(self):
+        self.profiler.sample_rate = 1.0
+        asyncio.run(self.endpoint(request=self.request({})))
+        self.assertEqual(self.profiler.profiled_requests, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from unittest.mock import patch
+
+from app.common.query_cache import QueryCache
+
+
+class TestQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = QueryCache(max_entries=2, ttl_seconds=10)
+
+    @patch("time.monotonic", return_value=100.0)
+    def test_hit_and_miss_counters(self, mock_time):
+        self.assertIsNone(self.cache.get("org", 1, "a"))
+        self.cache.put("org", 1, "a", "result")
+        self.assertEqual(self.cache.get("org", 1, "a"), "result")
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+
+    @patch("time.monotonic", return_value=100.0)
+    def test_lru_eviction(self, mock_time):
+        self.cache.put("org", 1, "a", 1)
+        self.cache.put("org", 1, "b", 2)
+        self.cache.get("org", 1, "a")
+        self.cache.put("org", 1, "c", 3)
+
+        self.assertEqual(self.cache.get("org", 1, "a"), 1)
+        self.assertIsNone(self.cache.get("org", 1, "b"))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    @patch("time.monotonic")
+    def test_ttl_expiry(self, mock_time):
+        mock_time.return_value = 100.0
+        self.cache.put("org", 1, "a", 1)
+        mock_time.return_value = 111.0
+
+        self.assertIsNone(self.cache.get("org", 1, "a"))
+        self.assertEqual(self.cache.stats()["expirations"], 1)
+
+    @patch("time.monotonic", return_value=100.0)
+    def test_newer_version_invalidates_entries(self, mock_time):
+        self.cache.put("org", 1, "a", 1)
+        self.assertIsNone(self.cache.get("org", 2, "a"))
+
+        # results computed against the old version are no longer stored
+        self.cache.put("org", 1, "a", 1)
+        self.assertEqual(self.cache.stats()["entries"], 0)
+        self.assertEqual(self.cache.stats()["invalidations"], 1)
+
+    @patch("time.monotonic", return_value=100.0)
+    def test_newer_version_keeps_other_scopes(self, mock_time):
+        self.cache.put("org", 1, "a", 1)
+        self.cache.put("other", 1, "a", 2)
+        self.assertIsNone(self.cache.get("org", 2, "a"))
+
+        self.assertEqual(self.cache.get("other", 1, "a"), 2)
+        self.assertEqual(self.cache.stats()["entries"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
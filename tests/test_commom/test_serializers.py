@@ -0,0 +1,71 @@
+import unittest
+import json
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.common.employee_store import EmployeeStore
+from app.common.serializers import encode_results, get_serializer, iter_ndjson
+
+
+class TestSerializers(unittest.TestCase):
+    def setUp(self):
+        json_path = Path(__file__).parent.parent / "mock_response/test_employees.json"
+        with open(json_path) as f:
+            self.records = json.load(f)
+        store = EmployeeStore([SimpleNamespace(**e) for e in self.records], [SimpleNamespace(id=1, name="AcmeCorp")])
+        self.partition = store.get_partition(1)
+
+        config_patcher = patch.dict(
+            "app.common.serializers.org_column_config",
+            {1: ["first_name", "status", "email"]},
+            clear=True,
+        )
+        config_patcher.start()
+        self.addCleanup(config_patcher.stop)
+
+    def test_projection_matches_column_config(self):
+        body = json.loads(encode_results(1, self.partition, [1, 0], page=1, total=2))
+
+        self.assertEqual(body, {
+            "results": [
+                {"first_name": "Bob", "status": "Not Started"},
+                {"first_name": "Alice", "status": "Active"},
+            ],
+            "page": 1,
+            "total": 2,
+        })
+
+    def test_org_without_config_gets_every_field(self):
+        body = json.loads(encode_results(99, self.partition, [0]))
+        self.assertEqual(body["results"], [self.records[0]])
+
+    def test_serializer_recompiled_when_config_changes(self):
+        serializer = get_serializer(1)
+        self.assertIs(get_serializer(1), serializer)
+
+        with patch.dict("app.common.serializers.org_column_config", {1: ["last_name"]}):
+            body = json.loads(encode_results(1, self.partition, [0]))
+        self.assertEqual(body["results"], [{"last_name": "Smith"}])
+
+    def test_row_fragments_are_cached_per_partition(self):
+        serializer = get_serializer(1)
+        serializer.encode_rows(self.partition, [0])
+
+        with patch.object(serializer, "encode_row") as encode_row:
+            serializer.encode_rows(self.partition, [0])
+        encode_row.assert_not_called()
+
+    def test_ndjson_chunks_one_projected_row_per_line(self):
+        chunks = list(iter_ndjson(1, self.partition, [0, 1], chunk_rows=1))
+
+        self.assertEqual(len(chunks), 2)
+        lines = b"".join(chunks).decode().splitlines()
+        self.assertEqual([json.loads(line) for line in lines], [
+            {"first_name": "Alice", "status": "Active"},
+            {"first_name": "Bob", "status": "Not Started"},
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
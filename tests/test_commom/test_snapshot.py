@@ -0,0 +1,90 @@
+import unittest
+from dataclasses import replace
+import json
+import struct
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from app.common.employee_store import EmployeeStore
+from app.common.employee_utils import EmployeeSearchService
+from app.common.snapshot import write_snapshot
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        json_path = Path(__file__).parent.parent / "mock_response/test_employees.json"
+        with open(json_path) as f:
+            employees = [SimpleNamespace(**e) for e in json.load(f)]
+        organizations = [SimpleNamespace(id=1, name="AcmeCorp"), SimpleNamespace(id=2, name="BetaTech")]
+        self.store = EmployeeStore(employees, organizations)
+
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.path = str(Path(tmp_dir.name) / "employees.snap")
+        write_snapshot(self.store, self.path)
+
+    def test_round_trip_matches_in_memory_store(self):
+        snapshot = EmployeeStore.from_snapshot(self.path)
+
+        self.assertEqual(snapshot.get_organization(2).name, "BetaTech")
+        expected = self.store.get_partition(1)
+        partition = snapshot.get_partition(1)
+        self.assertEqual(partition.rows(range(len(partition))), expected.rows(range(len(expected))))
+        self.assertEqual(partition.lookup("status", ["active", "not started"]), {0, 1})
+        self.assertEqual(partition.search_names("ohn"), {1})
+        self.assertEqual(partition.prefix_search("s", 10), [0])
+        self.assertEqual(partition.facet_counts("status"), expected.facet_counts("status"))
+        self.assertEqual(len(snapshot.get_partition(2)), 0)
+
+    def test_search_service_runs_on_snapshot(self):
+        with patch("app.common.employee_utils.employee_store", EmployeeStore.from_snapshot(self.path)):
+            results, total = EmployeeSearchService(1, {"department": "hr", "search": "ali"}).run(page=1, page_size=10)
+
+        self.assertEqual(total, 1)
+        self.assertEqual(results[0]["first_name"], "Alice")
+
+    def test_writes_copy_snapshot_partitions(self):
+        snapshot = EmployeeStore.from_snapshot(self.path)
+        mapped = snapshot.get_partition(1)
+        bob = mapped.rows([1])[0]
+        bob.status = "Terminated"
+
+        snapshot.upsert_employees([bob])
+
+        self.assertEqual(snapshot.get_partition(1).lookup("status", ["terminated"]), {1})
+        self.assertEqual(mapped.lookup("status", ["terminated"]), set())
+
+    def test_dataset_identity_follows_snapshot_content(self):
+        self.assertEqual(
+            EmployeeStore.from_snapshot(self.path).view().dataset,
+            EmployeeStore.from_snapshot(self.path).view().dataset,
+        )
+
+        other_path = f"{self.path}.other"
+        self.store.upsert_employees([replace(self.store.get_partition(1).rows([0])[0], first_name="Alicia")])
+        write_snapshot(self.store, other_path)
+        self.assertNotEqual(
+            EmployeeStore.from_snapshot(self.path).view().dataset,
+            EmployeeStore.from_snapshot(other_path).view().dataset,
+        )
+
+    def test_stale_version_is_rejected(self):
+        with open(self.path, "r+b") as f:
+            f.seek(8)
+            f.write(struct.pack("<I", 0))
+
+        with self.assertRaises(ValueError) as ctx:
+            EmployeeStore.from_snapshot(self.path)
+        self.assertIn("Stale snapshot", str(ctx.exception))
+
+    def test_non_snapshot_file_is_rejected(self):
+        Path(self.path).write_bytes(b"not a snapshot at all, just some bytes")
+
+        with self.assertRaises(ValueError):
+            EmployeeStore.from_snapshot(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()